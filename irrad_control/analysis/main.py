@@ -2,6 +2,8 @@ import sys
 import os
 import logging
 import argparse
+import matplotlib
+import matplotlib.pyplot as plt
 from matplotlib.backends.backend_pdf import PdfPages
 from tqdm import tqdm
 
@@ -92,7 +94,7 @@ def input_files(infiles):
 
 def save_plots(plots, outfile):
     """
-    Save plots to output file
+    Save plots to output file and close them
 
     Parameters
     ----------
@@ -103,10 +105,14 @@ def save_plots(plots, outfile):
     """
     for plot in tqdm(plots, desc="Saving plots", unit='plots'):
         outfile.savefig(plot)
+        plt.close(plot)
 
 
 def main():
 
+    # Plots are only written to PDF; use the non-interactive backend instead of creating GUI canvases
+    matplotlib.use('Agg')
+
     # Create parser
     analyse_parser = argparse.ArgumentParser(description="Perform analysis on irradiation data")
 
@@ -1,3 +1,4 @@
+import logging
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.dates as md
@@ -6,6 +7,7 @@ import matplotlib.cm as cm
 import irrad_control.analysis.constants as irrad_consts
 
 from datetime import datetime, timedelta
+from numba import njit
 from matplotlib.gridspec import GridSpec
 from matplotlib.patches import Rectangle
 from matplotlib.legend_handler import HandlerBase
@@ -46,6 +48,86 @@ class HandlerColormap(HandlerBase):
         return stripes
 
 
+def _to_local_datetime64(timestamps):
+    """
+    Converts an array of epoch *timestamps* to local-time datetime64 values in one go, instead of one datetime per element.
+    If the UTC offset changes within *timestamps* e.g. due to DST, falls back to converting each element on its own
+    """
+    timestamps = np.asarray(timestamps)
+    local_dt = (timestamps * 1e6).astype('datetime64[us]')
+    if timestamps.size:
+        # UTC offsets only change on the hour; sampling them every half hour over the whole range catches any transition in between
+        ts_min, ts_max = float(np.nanmin(timestamps)), float(np.nanmax(timestamps))
+        offsets = {datetime.fromtimestamp(ts).astimezone().utcoffset() for ts in np.append(np.arange(ts_min, ts_max, 1800.), ts_max)}
+        if len(offsets) != 1:
+            return np.array([datetime.fromtimestamp(ts) for ts in timestamps], dtype='datetime64[us]')
+        local_dt += np.timedelta64(offsets.pop())
+    return local_dt
+
+
+def _hist_range(data):
+    """
+    Returns the (min, max) range of *data* for histogramming. Like numpy.histogram2d, a degenerate range of constant
+    *data* is widened by 0.5 to either side
+
+    Parameters
+    ----------
+    data : np.ndarray
+        Finite data
+
+    Returns
+    -------
+    tuple
+        Lower and upper edge
+    """
+    lower, upper = float(np.min(data)), float(np.max(data))
+    if lower == upper:
+        lower, upper = lower - 0.5, upper + 0.5
+    return lower, upper
+
+
+@njit
+def _hist_2d(x, y, n_bins, x_range, y_range):
+    """
+    Histograms *x* and *y* into *n_bins* x *n_bins* equally-sized bins in a single pass; non-finite entries are skipped.
+    Like numpy.histogram2d, the last bin includes its upper edge.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Data along first dimension
+    y : np.ndarray
+        Data along second dimension
+    n_bins : int
+        Number of bins per dimension
+    x_range : tuple
+        Lower and upper edge along first dimension
+    y_range : tuple
+        Lower and upper edge along second dimension
+
+    Returns
+    -------
+    np.ndarray
+        Counts of shape (n_bins, n_bins), indexed as [x_bin, y_bin]
+    """
+    hist = np.zeros((n_bins, n_bins), dtype=np.int64)
+
+    x_scale = n_bins / (x_range[1] - x_range[0]) if x_range[1] > x_range[0] else 0.
+    y_scale = n_bins / (y_range[1] - y_range[0]) if y_range[1] > y_range[0] else 0.
+
+    for i in range(x.shape[0]):
+
+        if not (np.isfinite(x[i]) and np.isfinite(y[i])):
+            continue
+
+        if not (x_range[0] <= x[i] <= x_range[1] and y_range[0] <= y[i] <= y_range[1]):
+            continue
+
+        hist[min(int((x[i] - x_range[0]) * x_scale), n_bins - 1), min(int((y[i] - y_range[0]) * y_scale), n_bins - 1)] += 1
+
+    return hist
+
+
 def no_title(b):
     """Don't generate plot titles by setting background color to title color"""
     if b:
@@ -444,7 +526,7 @@ def plot_scan_overview(overview, beam_data, daq_config, temp_data=None):
                                                start_ts,
                                                stop_ts,
                                                to_secs=False)
-    ax_beam.plot(_to_dt(beam_ts), beam_nanos, label='Beam current')
+    ax_beam.plot(_to_local_datetime64(beam_ts), beam_nanos, label='Beam current')
     ax_beam.set_ylim(0, beam_nanos.max() * 1.25)
     ax_beam.set_ylabel(f"{daq_config['ion'].capitalize()} current / nA")
     ax_beam.set_xlabel(time_label)
@@ -517,7 +599,7 @@ def plot_scan_overview(overview, beam_data, daq_config, temp_data=None):
                                                     start_ts,
                                                     stop_ts,
                                                     to_secs=False)
-            ax_temp.plot(_to_dt(temp_ts), temp_dt, c=f'C{i+1}', label=f'{temp} temp.')
+            ax_temp.plot(_to_local_datetime64(temp_ts), temp_dt, c=f'C{i+1}', label=f'{temp} temp.')
         ax_temp.legend(loc='upper center', fontsize=8)
 
     ax_beam.xaxis.set_major_formatter(md.DateFormatter(time_fmt))
@@ -568,7 +650,7 @@ def plot_beam_current(timestamps, beam_current, ch_name=None, scan_data=None):
 
     dtfts = datetime.fromtimestamp(timestamps[0])
 
-    plot_data = {'xdata': [datetime.fromtimestamp(ts) for ts in timestamps],
+    plot_data = {'xdata': _to_local_datetime64(timestamps),
                  'ydata': beam_current,
                  'xlabel': f"{dtfts.strftime('%d %b %Y')}",
                  'ylabel': f"Cup channel {ch_name} current / nA",
@@ -613,10 +695,22 @@ def plot_relative_beam_position(horizontal_pos, vertical_pos, n_bins=100, scan_d
     ax_hist_2d.yaxis.set_tick_params(labelleft=False)
     ax_hist_v.invert_xaxis()
 
+    # Only samples with finite position in both planes are histogrammed
+    horizontal_pos, vertical_pos = np.asarray(horizontal_pos, dtype=float), np.asarray(vertical_pos, dtype=float)
+    finite = np.isfinite(horizontal_pos) & np.isfinite(vertical_pos)
+
+    if not finite.any():
+        logging.warning("No finite beam position data to histogram")
+        return fig, (ax_hist_2d, ax_hist_h, ax_hist_v)
+
     # Make the plots and trash what we don't need
-    _, _, _, im = ax_hist_2d.hist2d(horizontal_pos, vertical_pos, bins=(n_bins, n_bins), norm=mc.LogNorm(), cmin=1)
-    _, _, _ = ax_hist_h.hist(horizontal_pos, bins=n_bins)
-    _, _, _ = ax_hist_v.hist(vertical_pos, bins=n_bins, orientation='horizontal')
+    # Bin the 2D histogram in one compiled pass over the data; empty bins are not drawn, like hist2d(..., cmin=1)
+    h_range, v_range = _hist_range(horizontal_pos[finite]), _hist_range(vertical_pos[finite])
+    hist_2d = _hist_2d(horizontal_pos, vertical_pos, n_bins, h_range, v_range).astype(float)
+    hist_2d[hist_2d < 1] = np.nan
+    im = ax_hist_2d.pcolormesh(np.linspace(*h_range, n_bins + 1), np.linspace(*v_range, n_bins + 1), hist_2d.T, norm=mc.LogNorm())
+    _, _, _ = ax_hist_h.hist(horizontal_pos[finite], bins=n_bins, range=h_range)
+    _, _, _ = ax_hist_v.hist(vertical_pos[finite], bins=n_bins, range=v_range, orientation='horizontal')
 
     # Add colorbar to predefined axis
     fig.colorbar(im, cax=ax_cbar, label="")
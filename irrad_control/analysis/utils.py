@@ -55,8 +55,8 @@ def load_irrad_data(data_file, config_file, specify_entries=None, subtract_raw_o
             # Hold server data in dict
             irrad_data[server_name] = {}
 
-            # Read leaves i.e. Arrays and Tables
-            for leaf in dfile.walk_nodes("/", classname='Leaf'):
+            # Read leaves i.e. Arrays and Tables of this server only; each leaf is read once
+            for leaf in dfile.walk_nodes(f"/{server_name}", classname='Leaf'):
 
                 # Get all the nested levels; Ignore first 2 elements since they are empty (0) and server_name (1)
                 data_depth = leaf._v_pathname.split('/')[2:]
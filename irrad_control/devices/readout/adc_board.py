@@ -69,20 +69,15 @@ class ADCBoard(object):
 
     def read_channels(self, channel_names=None):
 
-        result = {}
-        ch_names = channel_names if channel_names is not None else list(range(len(self._adc_channels)))
-
-        if self._adc_channels:
-
-            raw_data = self.adc.read_sequence(self._adc_channels)
-
-            for i, raw_d in enumerate(raw_data):
-                result[ch_names[i]] = raw_d * self.adc.v_per_digit
-
-        else:
+        if not self._adc_channels:
             logging.warning("No input channels to read from are setup. Use 'setup_channels' method")
+            return {}
+
+        ch_names = channel_names if channel_names is not None else range(len(self._adc_channels))
+        v_per_digit = self.adc.v_per_digit
 
-        return result
+        # Scale raw readings of the whole sequence to voltages in one go
+        return {ch: raw_d * v_per_digit for ch, raw_d in zip(ch_names, self.adc.read_sequence(self._adc_channels))}
 
     def shutdown(self):
         self.adc.stop()
\ No newline at end of file
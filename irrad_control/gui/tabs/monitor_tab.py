@@ -1,5 +1,5 @@
-from PyQt5 import QtWidgets
-from collections import defaultdict
+from PyQt5 import QtWidgets, QtCore
+from collections import defaultdict, deque
 
 # Package imports
 from irrad_control.gui.widgets import plot_widgets as plots  # Actual plots
@@ -27,14 +27,38 @@ class IrradMonitorTab(QtWidgets.QWidget):
         self.plots = defaultdict(dict)
         self._plot_wrapper_widgets = defaultdict(dict)
 
+        # Servers whose plots have not been created yet
+        self._pending_tabs = deque()
+
         for server in self.setup:
-            self._init_tab(server=server)
+
+            # Tabs per server; filled with plots by _init_tab
+            self.monitor_tabs[server] = QtWidgets.QTabWidget()
+            self.daq_tabs.addTab(self.monitor_tabs[server], self.setup[server]['name'])
             self.enable_monitor(server=server, enable=False)
 
-    def _init_tab(self, server):
+            self._pending_tabs.append(server)
+
+        # Create the plots server by server once control returns to the event loop, so the window shows up first
+        QtCore.QTimer.singleShot(0, self._init_pending_tab)
+
+    def _init_pending_tab(self):
+        """Creates the plots of the next pending server and schedules the following one"""
+
+        if self._pending_tabs:
+            self._init_tab(server=self._pending_tabs.popleft())
+
+        if self._pending_tabs:
+            QtCore.QTimer.singleShot(0, self._init_pending_tab)
 
-        # Tabs per server
-        self.monitor_tabs[server] = QtWidgets.QTabWidget()
+    def ensure_tab(self, server):
+        """Creates the plots of *server* right away if they have not been created yet"""
+
+        if server in self._pending_tabs:
+            self._pending_tabs.remove(server)
+            self._init_tab(server=server)
+
+    def _init_tab(self, server):
 
         for monitor in self.monitors:
 
@@ -125,9 +149,12 @@ class IrradMonitorTab(QtWidgets.QWidget):
             if monitor_widget is not None:
                 self.monitor_tabs[server].addTab(monitor_widget, monitor)
 
-        self.daq_tabs.addTab(self.monitor_tabs[server], self.setup[server]['name'])
-
     def enable_monitor(self, server, enable=True):
+
+        # Data is about to arrive; plots are needed
+        if enable:
+            self.ensure_tab(server=server)
+
         for i in range(self.daq_tabs.count()):
             if self.daq_tabs.tabText(i) == self.setup[server]['name']:
                 self.daq_tabs.widget(i).setEnabled(enable)
@@ -144,6 +171,7 @@ class IrradMonitorTab(QtWidgets.QWidget):
 
 
     def add_fluence_hist(self, server, n_rows, kappa):
+        self.ensure_tab(server=server)
         self.plots[server]['fluence_plot'] = plots.FluenceHist(n_rows=n_rows, kappa=kappa)
         monitor_widget = self._create_plot_wrapper(plot_name='fluence_plot', server=server)
         self.monitor_tabs[server].addTab(monitor_widget, 'Fluence')
@@ -3,6 +3,7 @@ import pyqtgraph as pg
 import pyqtgraph.exporters as pg_ex
 import numpy as np
 import os
+from collections import deque
 from matplotlib import cm as mcmaps, colors as mcolors
 from PyQt5 import QtWidgets, QtCore, QtGui
 
@@ -460,6 +461,7 @@ class ScrollingIrradDataPlot(IrradPlotWidget):
         self._filled = False  # bool to see whether the array has been filled
         self._drate = None  # data rate
         self._colors = colors  # Colors to plot curves in
+        self._pending = deque()  # incoming (timestamp, data) which have not yet been filled into the arrays
 
         # Setup the main plot
         self._setup_plot()
@@ -531,9 +533,11 @@ class ScrollingIrradDataPlot(IrradPlotWidget):
 
     def reset_plot(self):
         self._idx, self._time, self._data_is_set = 0, None, False
+        self._pending.clear()
 
     def set_data(self, meta, data):
-        """Set the data of the plot. Input data is data plus meta data"""
+        """Set the data of the plot. Input data is data plus meta data. The data is only buffered here and filled into
+        the arrays in one go on the next refresh of the plot, see *_fill_pending*"""
 
         # Store timestamp of current data
         self._timestamp = meta['timestamp']
@@ -550,10 +554,26 @@ class ScrollingIrradDataPlot(IrradPlotWidget):
                 self._time = np.full(shape=shape, fill_value=np.nan)
                 for ch in self.channels:
                     self._data[ch] = np.full(shape=shape, fill_value=np.nan)
+                # Never buffer more data than can be displayed
+                self._pending = deque(maxlen=shape)
                 self._data_is_set = True
 
-        # Fill data
+        # Buffer data
         else:
+            self._pending.append((self._timestamp, data))
+
+    def _fill_pending(self):
+        """Fill the buffered data into the time and data arrays"""
+
+        n_pending = len(self._pending)
+
+        if not n_pending:
+            return
+
+        pending = list(self._pending)
+        self._pending.clear()
+
+        for timestamp, _ in pending:
 
             # If we made one cycle, start again from the beginning
             if self._idx == self._time.shape[0]:
@@ -562,25 +582,28 @@ class ScrollingIrradDataPlot(IrradPlotWidget):
 
             # If we start a new cycle, set new start timestamp and offset
             if self._idx == 0:
-                self._start = self._timestamp
+                self._start = timestamp
                 self._offset = 0
 
             # Set time axis
-            self._time[self._idx] = self._start - self._timestamp + self._offset
+            self._time[self._idx] = self._start - timestamp + self._offset
 
             # Increment index
             self._idx += 1
 
-            # Set data in curves
-            for ch in self.channels:
-                # Shift data to the right and set 0th element
-                self._data[ch][1:] = self._data[ch][:-1]
-                self._data[ch][0] = data[ch]
+        # Set data in curves
+        for ch in self.channels:
+            # Shift data to the right by the amount of new data and set the newest data first
+            self._data[ch][n_pending:] = self._data[ch][:-n_pending]
+            self._data[ch][:n_pending] = [d[ch] for _, d in reversed(pending)]
 
     def refresh_plot(self):
         """Refresh the plot. This method is supposed to be connected to the timeout-Signal of a QTimer"""
 
         if self._data_is_set:
+
+            self._fill_pending()
+
             for curve in self.curves:
 
                 # Update data of curves
@@ -604,10 +627,14 @@ class ScrollingIrradDataPlot(IrradPlotWidget):
         # Update attribute
         self._period = period
 
+        # Fill buffered data into current arrays before resizing
+        self._fill_pending()
+
         # Create new data and time
         shape = int(round(self._drate) * self._period + 1)
         new_data = dict([(ch, np.full(shape=shape, fill_value=np.nan)) for ch in self.channels])
         new_time = np.full(shape=shape, fill_value=np.nan)
+        self._pending = deque(maxlen=shape)
 
         # Check whether new time and data hold more or less indices
         decreased = self._time.shape[0] >= shape
@@ -169,9 +169,19 @@ class SessionSetup(BaseSetupWidget):
         # Add to layout
         self.add_widget(widget=[label_logging, combo_logging])
 
+        # Checkbox to compress the output data file; off by default since reading requires the Blosc HDF5 filter
+        label_compress = QtWidgets.QLabel('Compress output file:')
+        label_compress.setToolTip('Compress the HDF5 data file with Blosc. Reading it requires PyTables or the Blosc HDF5 filter plugin (e.g. h5py with hdf5plugin)')
+        chbx_compress = QtWidgets.QCheckBox()
+        chbx_compress.setChecked(False)
+
+        # Add to layout
+        self.add_widget(widget=[label_compress, chbx_compress])
+
         self.widgets['logging_combo'] = combo_logging
         self.widgets['folder_edit'] = edit_folder
         self.widgets['outfile_edit'] = edit_out_file
+        self.widgets['compress_chbx'] = chbx_compress
 
     def _get_output_folder(self):
         """Opens a QFileDialog to select/create an output folder"""
@@ -187,7 +197,8 @@ class SessionSetup(BaseSetupWidget):
         return {'loglevel': self.widgets['logging_combo'].currentText(),
                 'outfolder': self.widgets['folder_edit'].text(),
                 'outfile': os.path.join(self.widgets['folder_edit'].text(),
-                                        self.widgets['outfile_edit'].text() or self.widgets['outfile_edit'].placeholderText())
+                                        self.widgets['outfile_edit'].text() or self.widgets['outfile_edit'].placeholderText()),
+                'compress': self.widgets['compress_chbx'].isChecked()
                 }
 
 
@@ -32,6 +32,8 @@ class IrradConverter(DAQProcess):
         self._shifted_beam_array_length = 10000  # Allow to cover for very slow scans ~O(1000s) at default rate
         self._beam_unstable_time_window = 10  # Check the last 10 seconds of beam for stability
         self._beam_unstable_std_ratio = 5e-2  # Consider beam unstable once it fluctuates by 5% around its mean or the std is 5% of the I_FS
+        self._expected_stream_rows = int(1e7)  # Size the HDF5 chunks of the continuously written tables for long irradiations; larger chunks along time
+        self._output_filters = tb.Filters(complevel=5, complib='blosc:lz4', shuffle=False, bitshuffle=True)  # Compress all tables of the output file if the session enables it
 
         self.dtypes = analysis.dtype.IrradDtypes()
         self.hists = analysis.dtype.IrradHists()
@@ -45,8 +47,9 @@ class IrradConverter(DAQProcess):
 
     def _setup_daq(self):
 
-        # Open only one output file and organize its data in groups
-        self.output_table = tb.open_file(self.setup['session']['outfile'] + '.h5', 'w')
+        # Open only one output file and organize its data in groups; only compress on request since reading requires the Blosc HDF5 filter
+        filters = self._output_filters if self.setup['session'].get('compress', False) else None
+        self.output_table = tb.open_file(self.setup['session']['outfile'] + '.h5', 'w', filters=filters)
 
         # General setup; servers
         self.server = list(self.setup['server'].keys())
@@ -97,7 +100,7 @@ class IrradConverter(DAQProcess):
         else:
             return hist_name.capitalize()
 
-    def _create_data_entry(self, server, dname, location):
+    def _create_data_entry(self, server, dname, location, expectedrows=tb.parameters.EXPECTED_ROWS_TABLE):
 
         try:
             dtype = self.dtypes[dname]
@@ -108,7 +111,8 @@ class IrradConverter(DAQProcess):
         # Create and store tables
         self.data_tables[server][dname] = self.output_table.create_table(location,
                                                                          description=dtype,
-                                                                         name=dname.capitalize())
+                                                                         name=dname.capitalize(),
+                                                                         expectedrows=expectedrows)
         # Create arrays
         self.data_arrays[server][dname] = np.zeros(shape=1, dtype=dtype)
 
@@ -155,7 +159,9 @@ class IrradConverter(DAQProcess):
 
             # Create needed tables and arrays
             for dname in ('Raw', 'RawOffset', 'Beam', 'See', 'Damage', 'Scan', 'Irrad', 'Result'):
-                self._create_data_entry(server=server, dname=dname.lower(), location=f"/{server_setup['name']}")
+                # Raw, Beam and See data are written at the ADC rate and read back along time in the analysis
+                expectedrows = self._expected_stream_rows if dname in ('Raw', 'Beam', 'See') else tb.parameters.EXPECTED_ROWS_TABLE
+                self._create_data_entry(server=server, dname=dname.lower(), location=f"/{server_setup['name']}", expectedrows=expectedrows)
 
             # Create histogram group and entries
             self.output_table.create_group('/{}'.format(server_setup['name']), 'Histogram')
@@ -384,9 +390,10 @@ class IrradConverter(DAQProcess):
         tmp_array = self._beam_currents[server][:-1]
         self._beam_currents[server][1:] = tmp_array
 
-        self._beam_currents[server][0]['timestamp'] = self.data_arrays[server]['beam']['timestamp']
-        self._beam_currents[server][0]['beam'] = self.data_arrays[server]['beam']['beam_current']
-        self._beam_currents[server][0]['beam_err'] = self.data_arrays[server]['beam']['beam_current_error']
+        # The data arrays hold a single row; assign its scalars since numpy refuses to set a field from a 1-element array
+        self._beam_currents[server][0]['timestamp'] = self.data_arrays[server]['beam']['timestamp'][0]
+        self._beam_currents[server][0]['beam'] = self.data_arrays[server]['beam']['beam_current'][0]
+        self._beam_currents[server][0]['beam_err'] = self.data_arrays[server]['beam']['beam_current_error'][0]
         
         if self._beam_idxs[server] < self._shifted_beam_array_length - 1:
             self._beam_idxs[server] += 1
@@ -511,8 +518,9 @@ class IrradConverter(DAQProcess):
             ch_type = self.readout_setup[server]['types'][ch_idx]
 
             # Subtract offset from data; initially offset is 0 for all ch
+            # Offsets are stored as float32; keep a Python float, numpy would make the result float32 which is not JSON serializable
             if ch_type in self._lookups[server]['offset_ch']:
-                data[ch] -= self.data_arrays[server]['rawoffset'][ch][0]
+                data[ch] -= float(self.data_arrays[server]['rawoffset'][ch][0])
 
                 raw_data['data']['current'][ch] = analysis.formulas.v_sig_to_i_sig(v_sig=data[ch],
                                                                                    full_scale_current=self._lookups[server]['full_scale_current'][ch_type],
@@ -608,7 +616,8 @@ class IrradConverter(DAQProcess):
                     # Warn when extracted beam current is corrected
                     if rel_beam_loss >= self._beam_correction_threshold:
                         
-                        extracted_current = self.data_arrays[server]['beam']['beam_current'][0] - blm_current
+                        # Beam current is stored as float32; keep a Python float for the JSON serialized result
+                        extracted_current = float(self.data_arrays[server]['beam']['beam_current'][0]) - blm_current
 
 
                         logging.warning("Correcting extracted beam current from {:.2E} A to {:.2E} A".format(self.data_arrays[server]['beam']['beam_current'][0],
@@ -1128,7 +1137,7 @@ class IrradConverter(DAQProcess):
         if self.interaction_flags[server]['write'].is_set():
             self.store_data(server)
         else:
-            logging.debug("Data of {} is not being recorded...".format(self.setup['server'][server]['name']))
+            logging.debug("Data of %s is not being recorded...", self.setup['server'][server]['name'])
 
         # Calc and add data rate to interpreted meta data
         for in_data in interpreted_data:
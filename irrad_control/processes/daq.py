@@ -1,22 +1,26 @@
 import os
-import yaml
+import json
 import zmq
 import logging
 import signal
+from queue import SimpleQueue
+from logging.handlers import QueueHandler, QueueListener
 from time import sleep
 from multiprocessing import Process
-from threading import Event
+from threading import Event, Lock
 from zmq.log import handlers
-from irrad_control import pid_file
+from zmq.utils import jsonapi
+from irrad_control import pid_file, tmp_path
 from irrad_control.utils.worker import ThreadWorker
-from irrad_control.utils.utils import check_zmq_addr
+from irrad_control.utils.utils import check_zmq_addr, dumps_json, loads_json
 from collections import defaultdict
+from itertools import count
 
 
 class DAQProcess(Process):
     """Base-class of data acquisition processes"""
 
-    def __init__(self, name, daq_streams=None, event_streams=None, hwm=None, internal_sub=None, *args, **kwargs):
+    def __init__(self, name, daq_streams=None, event_streams=None, hwm=None, internal_sub=None, io_threads=None, affinity=None, realtime=None, *args, **kwargs):
         """
         Init the process
 
@@ -33,7 +37,16 @@ class DAQProcess(Process):
              High-water mark of zmq sockets
         internal_sub: str, None
             String of zmq address to which the internal subscribe listens to, which puts data on the data publisher port.
-            If None, use internal address which is used by internally created sockets (see *create_internal_data_pub*)
+            If None, use internal address which is used by internally created sockets (see *create_internal_data_pub*).
+            Must be a local address; loopback TCP addresses are replaced by an equivalent IPC address on POSIX systems
+        io_threads: int, None
+            Number of zmq I/O threads of the context. If None, use one I/O thread per four data streams, at least one
+        affinity: dict, None
+            Mapping of thread target names e.g. 'send_data' or 'recv_data' to the CPU core the thread is pinned to.
+            If None, threads are not pinned. Pinning is only available on platforms supporting *os.sched_setaffinity*
+        realtime: dict, None
+            Mapping of thread target names to the priority with which the thread runs under the real-time FIFO scheduling policy.
+            If None, threads keep the default policy. Requires *os.sched_setscheduler* and the CAP_SYS_NICE capability
         args: list
             Positional arguments which are passed to Process.__init__()
         kwargs: dict
@@ -52,27 +65,66 @@ class DAQProcess(Process):
         # Ports/sockets used by this process
         self.ports = {'log': None, 'cmd': None, 'data': None, 'event': None}
         self.sockets = {'log': None, 'cmd': None, 'data': None, 'event': None}
-        self.socket_type = {'log': zmq.PUB, 'cmd': zmq.REP, 'data': zmq.PUB, 'event': zmq.PUB}
+        self.socket_type = {'log': zmq.PUB, 'cmd': zmq.ROUTER, 'data': zmq.PUB, 'event': zmq.PUB}
+
+        # Routing envelope of the command which is currently handled; needed to route the reply on the zmq.ROUTER command socket
+        self._cmd_envelope = None
+
+        # Whether a reply to the command which is currently handled has been sent
+        self._reply_sent = False
+
+        # Replies of the individual commands of a command batch; None if no batch is currently handled
+        self._batch_replies = None
 
         # Attribute holding zmq context
         self.context = None
+        self._io_threads = io_threads
+
+        # Internal control publisher which wakes up polling threads on shutdown
+        self._ctrl_addr = 'inproc://ctrl'
+        self._ctrl_pub = None
+
+        # Timeout in ms of polls in the receiver / sender threads; threads are woken up by the control publisher on shutdown
+        self._poll_timeout = 100
+
+        # Count of messages which could not be sent; next() on it is atomic, so threads can share it
+        self._dropped_msgs = count(1)
 
         # Sets internal subscriber address from which data is gathered (from potentially many sources) and published (on one port);
         # usually this is some intra-process communication protocol such as inproc/ipc. If not, this process listens to a different
         # DAQ processes DAQ threads in an attempt to distribute the load on multiple CPU cores more evenly
         self._internal_sub_addr = internal_sub if internal_sub is not None and check_zmq_addr(internal_sub) else 'inproc://internal'
 
-        # High-water mark for all ZMQ sockets
-        self.hwm = 100 if hwm is None or not isinstance(hwm, int) else hwm
+        # Aggregating data of multiple processes on this host via loopback TCP is replaced by IPC (Unix domain sockets), avoiding the TCP/IP stack.
+        # The IPC address only depends on the port, so all processes given the same TCP address end up on the same IPC address
+        if os.name == 'posix' and self._internal_sub_addr.startswith(('tcp://127.0.0.1:', 'tcp://localhost:')):
+            self._internal_sub_addr = 'ipc://{}/internal_{}'.format(tmp_path, self._internal_sub_addr.split(':')[-1])
+
+        # High-water mark for all ZMQ sockets; DAQ streams arrive at O(100 Hz) so allow for several seconds of backlog
+        self.hwm = 1000 if hwm is None or not isinstance(hwm, int) else hwm
+
+        # Typical size of a message in bytes; kernel socket buffers are sized to hold *self.hwm* of those
+        self.msg_size = 4096
 
         # Attribute to store irrad session setup in
         self.setup = None
 
-        # List to hold all threads of the process
+        # Listener which publishes log records, queued by all threads, on the log socket
+        self._log_listener = None
+
+        # List to hold all threads of the process; threads may be launched from any thread, therefore guard with lock
         self.threads = []
+        self._threads_lock = Lock()
+
+        # CPU cores to pin threads to and real-time priorities of threads, by name of the thread target
+        self.affinity = {} if affinity is None else affinity
+        self.realtime = {} if realtime is None else realtime
 
         # List of input data stream addresses
         self.daq_streams = []
+
+        # Whether to relay incoming data streams as is instead of calling *handle_data*; set in subclasses which only forward data
+        self.passthrough = False
         
         if daq_streams is not None:
             self.add_daq_stream(daq_stream=daq_streams)
@@ -93,8 +145,14 @@ class DAQProcess(Process):
     def _setup_zmq(self):
         """ Setup the zmq context instance and allocate needed sockets """
 
-        # Create a context instance
-        self.context = zmq.Context()
+        # Create a context instance; aggregating many data streams is spread over multiple I/O threads
+        io_threads = self._io_threads if isinstance(self._io_threads, int) else max(1, len(self.daq_streams) // 4)
+        self.context = zmq.Context(io_threads=io_threads)
+
+        # Create control publisher; bind before any thread connects to it
+        self._ctrl_pub = self.context.socket(zmq.PUB)
+        self._ctrl_pub.setsockopt(zmq.LINGER, 0)
+        self._ctrl_pub.bind(self._ctrl_addr)
 
         # Create sockets
         self._allocate_sockets()
@@ -102,7 +160,7 @@ class DAQProcess(Process):
     def _allocate_sockets(self, min_port=8000, max_port=9000, max_tries=100, rep_linger=500):
         """
         Method to acquire all needed sockets. Ports are selected by zmq's *bind_to_random_port* method which
-        eliminates the need for hard-coded ports. The port configuration is stored in a PID.yaml within the
+        eliminates the need for hard-coded ports. The port configuration is stored in a PID file within the
         config-folder of the package
 
         Parameters
@@ -114,7 +172,7 @@ class DAQProcess(Process):
         max_tries:
             maximum number of tries to bind to a port within range *min_port* to *max_port*
         rep_linger: int
-            number of milliseconds to wait before closing socket; useful for sending last reply on zmq.REP
+            number of milliseconds to wait before closing socket; useful for sending last reply on zmq.ROUTER
         """
 
         # Loop over needed sockets and create and bind
@@ -123,40 +181,88 @@ class DAQProcess(Process):
             # Create socket
             self.sockets[sock] = self.context.socket(self.socket_type[sock])
 
+            # Keep TCP connections to remote hosts alive while idle
+            self.sockets[sock].setsockopt(zmq.TCP_KEEPALIVE, 1)
+
             # If the socket is a publisher, set a high water mark in order to protect the process from memory issues if subscribers can't receive fast enough
             if self.socket_type[sock] == zmq.PUB:
                 self.sockets[sock].setsockopt(zmq.SNDHWM, self.hwm)
+                # Size the kernel send buffer to absorb bursts of DAQ data instead of stalling on TCP backpressure
+                self.sockets[sock].setsockopt(zmq.SNDBUF, self.hwm * self.msg_size)
+                # Make subscription handling explicit instead of relying on defaults; only new subscriptions are processed
+                self.sockets[sock].setsockopt(zmq.XPUB_VERBOSE, 0)
 
             # If the socket is a reply socket, set a linger period to avoid message loss
-            elif self.socket_type[sock] == zmq.REP:
+            elif self.socket_type[sock] == zmq.ROUTER:
                 self.sockets[sock].setsockopt(zmq.LINGER, rep_linger)
 
             # Bind socket to random port
             self.ports[sock] = self.sockets[sock].bind_to_random_port(addr='tcp://*', min_port=min_port, max_port=max_port, max_tries=max_tries)
 
-    def create_internal_data_pub(self):
+    def create_internal_data_pub(self, conflate=False):
         """
         Create an internal publisher socket which publishes data in a sub-thread. The main *send_data* method
         has an internal subscriber bound to this publishers address and receives its data.
 
+        Parameters
+        ----------
+        conflate: bool
+            Whether to only keep the most recent message in the outgoing queue; useful for latest-value data
+            where stale messages can be dropped if *send_data* lags behind
+
         Returns
         -------
-        zmq.context.socket(zmq.PUB):
-            A publisher socket which is used to publish data from concurrent thread
+        zmq.context.socket(zmq.XPUB), zmq.context.socket(zmq.PUB):
+            A publisher socket which is used to publish data from concurrent thread; send on it via *_pub_send* with *block=True*
         """
 
-        internal_data_pub = self.context.socket(zmq.PUB)
+        # A zmq.PUB silently drops at the high-water mark; unless conflating, the data is relayed by a zmq.XPUB which refuses to drop.
+        # Sending then waits up to the poll timeout for *send_data* to catch up before the message is dropped and counted in *_pub_send*
+        if conflate:
+            internal_data_pub = self.context.socket(zmq.PUB)
+            internal_data_pub.setsockopt(zmq.CONFLATE, 1)
+        else:
+            internal_data_pub = self.context.socket(zmq.XPUB)
+            internal_data_pub.setsockopt(zmq.XPUB_NODROP, 1)
+            internal_data_pub.setsockopt(zmq.SNDTIMEO, self._poll_timeout)
         internal_data_pub.setsockopt(zmq.SNDHWM, self.hwm)
         internal_data_pub.setsockopt(zmq.LINGER, 0)
         internal_data_pub.connect(self._internal_sub_addr)
 
         return internal_data_pub
 
+    def _create_poller(self, sock):
+        """
+        Create a poller which polls *sock* as well as a subscriber to the internal control publisher.
+        The latter wakes up the poller on shutdown which allows for long poll timeouts instead of busy polling
+
+        Parameters
+        ----------
+        sock: zmq.Socket
+            socket to poll for incoming messages
+
+        Returns
+        -------
+        tuple: (zmq.Poller, zmq.Socket)
+            The poller and the control subscriber, which needs to be closed by the caller
+        """
+
+        ctrl_sub = self.context.socket(zmq.SUB)
+        ctrl_sub.setsockopt(zmq.LINGER, 0)
+        ctrl_sub.connect(self._ctrl_addr)
+        ctrl_sub.setsockopt(zmq.SUBSCRIBE, b'')
+
+        poller = zmq.Poller()
+        poller.register(sock, zmq.POLLIN)
+        poller.register(ctrl_sub, zmq.POLLIN)
+
+        return poller, ctrl_sub
+
     def _write_pid_file(self):
         """
-        Method that writes information of this process into a yaml file and stores it in the config-folder
+        Method that writes information of this process into a JSON file and stores it in the config-folder
         of this package. The file is used by the main process of *irrad_control* to determine the PID as
-        well as the ports.
+        well as the ports. JSON is valid YAML, so the file can be read by YAML readers as well.
         """
 
         # Construct dict with information on the process
@@ -169,7 +275,7 @@ class DAQProcess(Process):
 
         # Make file path; if a file already exists,overwrite
         with open(pid_file, 'w') as pf:
-            yaml.safe_dump(proc_info, pf, default_flow_style=False)
+            json.dump(proc_info, pf)
 
     def _remove_pid_file(self):
         """ Method that removes the PID file in the config-folder of this package on process shutdown process """
@@ -188,15 +294,42 @@ class DAQProcess(Process):
         # Write PID file
         self._write_pid_file()
 
+    def _apply_scheduling(self, name):
+        """Pin the calling thread to the CPU core and set the real-time priority which are configured for *name*, if any"""
+
+        # PID 0 is the calling thread
+        if name in self.affinity:
+            try:
+                os.sched_setaffinity(0, {self.affinity[name]})
+            except (AttributeError, OSError) as e:
+                logging.warning(f"Could not pin thread executing function '{name}' to CPU core {self.affinity[name]}: {repr(e)}")
+
+        if name in self.realtime:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.realtime[name]))
+            except (AttributeError, OSError) as e:
+                logging.warning(f"Could not set real-time priority {self.realtime[name]} of thread executing function '{name}': {repr(e)}")
+
+    def _run_scheduled(self, target, *args, **kwargs):
+        """Apply the scheduling configured for *target* to the calling thread and run *target* function"""
+
+        self._apply_scheduling(target.__name__)
+
+        return target(*args, **kwargs)
+
     def launch_thread(self, target, *args, **kwargs):
         """Launch a ThreadWorker instance with *target* function and append to self.threads"""
 
-        # Create and launch
-        thread = ThreadWorker(target=target, args=args, kwargs=kwargs)
+        # Create and launch; pin to CPU core and / or set real-time priority if requested
+        if target.__name__ in self.affinity or target.__name__ in self.realtime:
+            thread = ThreadWorker(target=self._run_scheduled, name=target.__name__, args=(target,) + args, kwargs=kwargs)
+        else:
+            thread = ThreadWorker(target=target, args=args, kwargs=kwargs)
         thread.start()
 
         # Add to instance threads
-        self.threads.append(thread)
+        with self._threads_lock:
+            self.threads.append(thread)
 
     def _launch_threads(self):
         """Launch this instances threads. Must be called within the *run* method"""
@@ -231,9 +364,12 @@ class DAQProcess(Process):
         # Set level
         logging.getLogger().setLevel(level=numeric_level)
 
-        # Create logging publisher first
-        handler = handlers.PUBHandler(self.sockets['log'])
-        logging.getLogger().addHandler(handler)
+        # Create logging publisher first; it is owned by a listener thread. All other threads only put records into
+        # a queue instead of formatting and sending them on the log socket themselves
+        log_queue = SimpleQueue()
+        logging.getLogger().addHandler(QueueHandler(log_queue))
+        self._log_listener = QueueListener(log_queue, handlers.PUBHandler(self.sockets['log']), respect_handler_level=True)
+        self._log_listener.start()
 
         # Allow connections to be made
         sleep(1)
@@ -262,45 +398,87 @@ class DAQProcess(Process):
         """
         Receiving commands at self.sockets['cmd']. This function is executed in an individual thread
         on calling the process' *start* method. This enables to receive commands on self.sockets['cmd']
-        for setting up.
+        for setting up. The socket is a zmq.ROUTER which queues requests of all clients, which connect
+        via zmq.REQ sockets, while commands are handled one at a time in this thread.
         """
 
-        # Receive commands; wait 10 ms for stop flag
-        while not self.stop_flags['__recv__'].wait(1e-2):
+        # Bind socket used in the loop to local; it is never reassigned while the loop runs
+        cmd_sock = self.sockets['cmd']
 
-            # Check if were working on a command. We have to work sequentially
-            if not self.state_flags['__busy__'].is_set():
+        poller, ctrl_sub = self._create_poller(cmd_sock)
 
-                # Poll the command receiver socket for 1 ms; continue if there are no commands
-                if not self.sockets['cmd'].poll(timeout=1, flags=zmq.POLLIN):
-                    continue
+        # Bind the bound methods used in the loop to locals; the underlying objects never change
+        is_stopped, poll = self.stop_flags['__recv__'].is_set, poller.poll
 
-                logging.debug("Receiving command")
+        # Receive commands until stop flag is set; commands are handled sequentially in this thread
+        while not is_stopped():
 
-                # Cmd must be dict with command as 'cmd' key and 'args', 'kwargs' keys
-                cmd_dict = self.sockets['cmd'].recv_json()
+            # Poll the command receiver socket; wakes up on incoming commands or on shutdown
+            if cmd_sock not in dict(poll(timeout=self._poll_timeout)):
+                continue
 
-                # Command data
-                if 'data' not in cmd_dict:
-                    cmd_dict['data'] = None
+            logging.debug("Receiving command")
 
-                error_reply = self._check_cmd(cmd_dict=cmd_dict)
+            # Split off the routing envelope of the client; the last frame is the actual command
+            *self._cmd_envelope, cmd_msg = cmd_sock.recv_multipart()
 
-                # Check for errors
-                if error_reply:
-                    self._send_reply(reply=error_reply, sender=self.pname, _type='ERROR', data=None)
-                else:
-                    logging.debug('Handling command {}'.format(cmd_dict['cmd']))
+            # Cmd must be dict with command as 'cmd' key and 'args', 'kwargs' keys
+            cmd_dict = loads_json(cmd_msg)
+            self._reply_sent = False
 
-                    # Set cmd to busy; other commands send will be queued and received later
-                    self.state_flags['__busy__'].set()
+            # Command data
+            if 'data' not in cmd_dict:
+                cmd_dict['data'] = None
 
+            error_reply = self._check_cmd(cmd_dict=cmd_dict)
+
+            # Check for errors
+            if error_reply:
+                self._send_reply(reply=error_reply, sender=self.pname, _type='ERROR', data=None)
+            else:
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug('Handling command {}'.format(cmd_dict['cmd']))
+
+                if cmd_dict['cmd'] == 'batch':
+                    self._handle_batch(target=cmd_dict['target'], cmds=cmd_dict['data'])
+                else:
                     self.handle_cmd(**cmd_dict)
 
-                # Check if a reply has been sent while handling the command. If not send generic reply which resets flag
-                if self.state_flags['__busy__'].is_set():
-                    self._send_reply(reply=cmd_dict['cmd'], sender=cmd_dict['target'], _type='STANDARD')
-                    # Now flag is cleared
+            # Check if a reply has been sent while handling the command. If not send generic reply
+            if not self._reply_sent:
+                self._send_reply(reply=cmd_dict['cmd'], sender=cmd_dict['target'], _type='STANDARD')
+
+        ctrl_sub.close()
+
+    def _handle_batch(self, target, cmds):
+        """
+        Handles a batch of commands for *target* in the order they were sent. The replies of the individual
+        commands are collected and sent back as the data of a single 'batch' reply
+
+        Parameters
+        ----------
+        target: str
+            target of all commands in the batch
+        cmds: list
+            list of dicts containing 'cmd' and optionally 'data' fields
+        """
+
+        self._batch_replies = []
+
+        try:
+            for cmd_dict in cmds:
+
+                n_replies = len(self._batch_replies)
+
+                self.handle_cmd(target=target, cmd=cmd_dict['cmd'], data=cmd_dict.get('data'))
+
+                # Each command in the batch gets a reply; if none was sent while handling the command, add generic reply
+                if len(self._batch_replies) == n_replies:
+                    self._send_reply(reply=cmd_dict['cmd'], sender=target, _type='STANDARD')
+        finally:
+            batch_replies, self._batch_replies = self._batch_replies, None
+
+        self._send_reply(reply='batch', sender=target, _type='STANDARD', data=batch_replies)
 
     def _check_cmd(self, cmd_dict):
         """
@@ -333,8 +511,8 @@ class DAQProcess(Process):
 
     def _send_reply(self, reply, _type, sender, data=None):
         """
-        Method to reply to a received command via the *self.sockets['cmd']* socket. After replying, the
-        *self.state_flags['__busy__']* is cleared in order to able to receive new commands
+        Method to reply to a received command via the *self.sockets['cmd']* socket. Only one reply
+        per command is sent; if no reply is sent while handling a command, *recv_cmd* sends a generic one
 
         Parameters
         ----------
@@ -355,9 +533,14 @@ class DAQProcess(Process):
         if data is not None:
             reply_dict['data'] = data
 
-        # Send away and clear busy flag
-        self.sockets['cmd'].send_json(reply_dict)
-        self.state_flags['__busy__'].clear()
+        # Collect reply if we are handling a command batch
+        if self._batch_replies is not None:
+            self._batch_replies.append(reply_dict)
+            return
+
+        # Send away to the client which sent the command
+        self.sockets['cmd'].send_multipart(self._cmd_envelope + [dumps_json(reply_dict)], copy=False)
+        self._reply_sent = True
 
     def send_data(self):
         """
@@ -369,19 +552,55 @@ class DAQProcess(Process):
         internal_data_sub.bind(self._internal_sub_addr)
         internal_data_sub.setsockopt(zmq.SUBSCRIBE, b'')  # specify bytes for Py3
 
-        while not self.stop_flags['__send__'].is_set():  # Send data out as fast as possible
+        poller, ctrl_sub = self._create_poller(internal_data_sub)
 
-            # Poll the command receiver socket for 1 ms; continue if there are no commands
-            if not internal_data_sub.poll(timeout=1, flags=zmq.POLLIN):
+        # Bind the bound methods used in the loop to locals; the underlying objects never change
+        is_stopped, poll, recv = self.stop_flags['__send__'].is_set, poller.poll, internal_data_sub.recv
+        data_sock, pub_send = self.sockets['data'], self._pub_send
+
+        while not is_stopped():  # Send data out as fast as possible
+
+            # Poll the internal subscriber socket; wakes up on incoming data or on shutdown
+            if internal_data_sub not in dict(poll(timeout=self._poll_timeout)):
                 continue
 
-            # Get outgoing data from internal subscriber socket
-            data = internal_data_sub.recv_json(zmq.NOBLOCK)
+            # Drain all outgoing data which is already queued on the internal subscriber socket
+            msgs = []
+            try:
+                while True:
+                    msgs.append(recv(zmq.NOBLOCK))
+            except zmq.Again:
+                pass
 
-            # Send data on socket
-            self.sockets['data'].send_json(data)
+            # Relay the already-serialized data on socket; messages stay individual since subscribers expect single-frame JSON
+            for msg in msgs:
+                pub_send(data_sock, msg)
 
         internal_data_sub.close()
+        ctrl_sub.close()
+
+    def _pub_send(self, pub, msg, block=False):
+        """
+        Send *msg* on publisher socket *pub* without copying the payload. If the message cannot be queued it is dropped;
+        drops are counted and logged. Note that a zmq.PUB drops at its high-water mark without notice
+
+        Parameters
+        ----------
+        pub: zmq.Socket
+            zmq.PUB or zmq.XPUB socket to send on
+        msg: bytes, zmq.Frame
+            serialized message
+        block: bool
+            Whether to wait for the socket to accept *msg*, up to its send timeout. Used for the internal data publishers
+            (see *create_internal_data_pub*) which must not lose data; outgoing streams are sent to without blocking
+        """
+        try:
+            pub.send(msg, flags=0 if block else zmq.NOBLOCK, copy=False, track=False)
+        except zmq.Again:
+            n_dropped = next(self._dropped_msgs)
+            # Log the first drop and then every 1000th to not flood the log
+            if n_dropped == 1 or n_dropped % 1000 == 0:
+                logging.warning(f"Dropped {n_dropped} message(s) in total: the receiving end does not keep up")
 
     def _add_stream(self, stream, stream_container):
         """
@@ -406,7 +625,7 @@ class DAQProcess(Process):
             if check_zmq_addr(strm) and strm not in stream_container:
                 stream_container.append(strm)
 
-    def _recv_from_stream(self, kind, stream, callback, pub_results=False, delay=None):
+    def _recv_from_stream(self, kind, stream, callback, pub_results=False, delay=None, passthrough=False):
         """
         Method which receives data from specific streams and calls a callback as well as publishes results internally.
 
@@ -421,7 +640,10 @@ class DAQProcess(Process):
         pub_results : bool, optional
             Whther to create an internal publisher which send data via the 'send_data' method, by default False
         delay : float, optional
-            Time in seconds sleep in between incoming data checks; useful save resources, by default None
+            Minimum time in seconds to wait for incoming data per poll; useful to save resources, by default None
+        passthrough : bool, optional
+            Whether to relay incoming packets as is to the internal publisher without deserializing them and
+            without calling *callback*; requires *pub_results*, by default False
         """
 
         if stream:
@@ -430,6 +652,8 @@ class DAQProcess(Process):
 
             # Create subscriber for raw and XY-Stage data
             external_sub = self.context.socket(zmq.SUB)
+            external_sub.setsockopt(zmq.RCVHWM, self.hwm)
+            external_sub.setsockopt(zmq.RCVBUF, self.hwm * self.msg_size)
 
             # Loop over all servers and connect to their respective data streams
             for s in stream:
@@ -440,29 +664,41 @@ class DAQProcess(Process):
 
             if pub_results:
                 internal_pub = self.create_internal_data_pub()
+                pub_send, dumps = self._pub_send, jsonapi.dumps
+
+            poller, ctrl_sub = self._create_poller(external_sub)
+
+            # Waiting in the poll itself releases the GIL; no need for an additional sleep in between polls
+            poll_timeout = self._poll_timeout if delay is None else max(self._poll_timeout, int(delay * 1e3))
+
+            # Bind the bound methods used in the loop to locals; the underlying objects never change
+            is_stopped, poll, recv, loads = self.stop_flags['__recv__'].is_set, poller.poll, external_sub.recv, jsonapi.loads
 
             # While event not set receive data
-            while not self.stop_flags['__recv__'].is_set():
+            while not is_stopped():
 
-                # Poll the socket for 1 ms; continue if there is nothing
-                if not external_sub.poll(timeout=1, flags=zmq.POLLIN):
-                    # Allow the thread to release the GIL while sleeping if we don't need to check for incoming stream data full-speed
-                    if delay is not None:
-                        sleep(delay)
+                # Poll the socket; continue if there is nothing e.g. we were woken up on shutdown
+                if external_sub not in dict(poll(timeout=poll_timeout)):
                     continue
 
-                # Get data
-                data = external_sub.recv_json(flags=zmq.NOBLOCK)
+                # Get data; poll reported incoming data so this does not block
+                raw = recv()
+
+                # Relay data without deserializing it
+                if passthrough:
+                    pub_send(internal_pub, raw, block=True)
+                    continue
 
                 # Callback for data
-                result = callback(data)
+                result = callback(loads(raw))
 
                 # Publish data
                 if pub_results:
                     for res in result:
-                        internal_pub.send_json(res)
+                        pub_send(internal_pub, dumps(res), block=True)
 
             external_sub.close()
+            ctrl_sub.close()
             if pub_results:
                 internal_pub.close()
 
@@ -483,7 +719,7 @@ class DAQProcess(Process):
 
     def recv_data(self):
         """Main method which receives raw data and calls interpretation and data storage methods"""
-        self._recv_from_stream(kind='data', stream=self.daq_streams, callback=self.handle_data, pub_results=True)
+        self._recv_from_stream(kind='data', stream=self.daq_streams, callback=self.handle_data, pub_results=True, passthrough=self.passthrough)
 
     def add_event_stream(self, event_stream):
         """
@@ -522,6 +758,10 @@ class DAQProcess(Process):
         for flag in self.stop_flags:
             self.stop_flags[flag].set()
 
+        # Wake up all polling threads
+        if self._ctrl_pub is not None:
+            self._pub_send(self._ctrl_pub, b'')
+
     def _watch_threads(self):
         """
         Main function which is run: checks all the threads in which work is done and logs when an exception occurrs
@@ -530,24 +770,30 @@ class DAQProcess(Process):
         # Check threads until stop flag is set
         while not self.stop_flags['__watch__'].wait(1.0):
 
-            # Loop over all threads and check whether exceptions have occurred
-            for thread in self.threads:
+            with self._threads_lock:
 
-                is_alive = thread.is_alive()
+                # Threads which are still alive; finished threads are dropped for garbage collection
+                alive_threads = []
 
-                # If an exception occurred and has not yet been reported
-                if thread.exception is not None:
+                # Loop over all threads and check whether exceptions have occurred
+                for thread in self.threads:
 
-                    # Construct error message
-                    msg = "A {} exception occurred in thread executing function '{}':\n".format(type(thread.exception).__name__, thread.name)
-                    msg += "{}\nThread is currently {}alive ".format(thread.traceback_str, '' if is_alive else 'not ')
+                    is_alive = thread.is_alive()
 
-                    # Log message
-                    logging.error(msg)
+                    # If an exception occurred and has not yet been reported
+                    if thread.exception is not None:
 
-                # Remove thread object from container for garbage collection
-                if not is_alive:
-                    self.threads.remove(thread)
+                        # Construct error message
+                        msg = "A {} exception occurred in thread executing function '{}':\n".format(type(thread.exception).__name__, thread.name)
+                        msg += "{}\nThread is currently {}alive ".format(thread.traceback_str, '' if is_alive else 'not ')
+
+                        # Log message
+                        logging.error(msg)
+
+                    if is_alive:
+                        alive_threads.append(thread)
+
+                self.threads = alive_threads
 
     def _close(self):
 
@@ -558,11 +804,18 @@ class DAQProcess(Process):
         # Close action
         self._remove_pid_file()
 
+        if self._ctrl_pub is not None:
+            self._ctrl_pub.close()
+
         # Clean up
         self.clean_up()
 
         logging.info("Process {} with PID {} shut down successfully".format(self.pname, self.pid))
 
+        # Publish remaining log records and stop the listener thread
+        if self._log_listener is not None:
+            self._log_listener.stop()
+
     def run(self):
         """ Main process function"""
 
@@ -1,17 +1,23 @@
+import os
 import sys
 import time
 import logging
 import platform
 import zmq
+import traceback
+from queue import SimpleQueue
+from itertools import count
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 
 from PyQt5 import QtCore, QtWidgets, QtGui
-from threading import Event
+from threading import Lock, Thread
 
 # Package imports
 from irrad_control.utils.logger import CustomHandler, LoggingStream, log_levels
 from irrad_control.utils.worker import QtWorker
 from irrad_control.utils.proc_manager import ProcessManager
-from irrad_control.utils.utils import get_current_git_branch
+from irrad_control.utils.utils import get_current_git_branch, dumps_json, loads_json
 from irrad_control.gui.widgets import DaqInfoWidget, LoggingWidget, EventWidget
 from irrad_control.gui.tabs import IrradSetupTab, IrradControlTab, IrradMonitorTab
 
@@ -24,7 +30,7 @@ class IrradGUI(QtWidgets.QMainWindow):
     """Inits the main window of the irrad_control software."""
 
     # PyQt signals
-    data_received = QtCore.pyqtSignal(dict)  # Signal for data
+    data_received = QtCore.pyqtSignal(list)  # Signal for batches of data
     log_received = QtCore.pyqtSignal(dict)  # Signal for log
     event_received = QtCore.pyqtSignal(dict)  # Signal for events
     reply_received = QtCore.pyqtSignal(dict)  # Signal for reply
@@ -35,33 +41,99 @@ class IrradGUI(QtWidgets.QMainWindow):
         # Setup dict of the irradiation; is set when setup tab is completed
         self.setup = None
         
-        # Needed in order to stop receiver threads
-        self.stop_recv = Event()
+        # Receiver thread which is stopped by sending to an inproc socket at this address
+        self._recv_thread = None
+        self._stop_recv_addr = 'inproc://stop_recv_{}'.format(id(self))
         
         # ZMQ context; THIS IS THREADSAFE! SOCKETS ARE NOT!
         # EACH SOCKET NEEDS TO BE CREATED WITHIN ITS RESPECTIVE THREAD/PROCESS!
-        self.context = zmq.Context()
+        # Shared by all modules of the GUI process; created in _init_setup, before any socket, once the amount of servers is known
+        self.context = None
+
+        # Persistent command sockets, one per host, and the locks serializing access to them
+        self._cmd_sockets = {}
+        self._cmd_locks = {}
+        self._cmd_lock = Lock()
+
+        # Queues of commands per host which are sent one after another by a dispatcher thread per host
+        self._cmd_queues = {}
+        self._cmd_dispatchers = {}
+
+        # Monotonically increasing request ids to match replies to commands
+        self._cmd_rid = count()
         
         # QThreadPool manages GUI threads on its own; every runnable started via start(runnable) is auto-deleted after.
         self.threadpool = QtCore.QThreadPool()
+        self.threadpool.setMaxThreadCount(max(8, 2 * (os.cpu_count() or 1)))
 
         # Class to manage the server, interpreter and additional subprocesses
         self.proc_mngr = ProcessManager()
 
         # Keep track of successfully started daq processes
-        self._started_daq_proc_hostnames = []
+        self._started_daq_proc_hostnames = set()
+
+        # Hosts on which a DAQProcess needs to be started: all servers and the converter on localhost; set in _init_setup
+        self._expected_daq_hosts = set()
+
+        # Addresses to subscribe to per stream; set in _init_setup
+        self._stream_addrs = {}
 
         # Shutdown related variables
         self._procs_launched = False
         self._shutdown_initiated = False
         self._shutdown_complete = False
         self._stopped_daq_proc_hostnames = []
+        self._alive_procs = []
+        self._validate_close_checks = 0
+
+        # Message boxes shown on close by title, see _get_msg_box
+        self._msg_boxes = {}
         
+        # Handlers of incoming data by data type
+        self._data_handlers = {'raw': self._on_raw_data,
+                               'beam': self._on_beam_data,
+                               'hist': self._on_hist_data,
+                               'damage': self._on_damage_data,
+                               'scan': self._on_scan_data,
+                               'temp_arduino': self._on_temp_arduino_data,
+                               'temp_daq_board': self._on_temp_daq_board_data,
+                               'dose_rate': self._on_dose_rate_data,
+                               'axis': self._on_axis_data}
+
+        # Handlers of standard replies by sender and reply
+        self._reply_handlers = {('server', 'start'): self._on_server_start_reply,
+                                ('server', 'shutdown'): self._on_server_shutdown_reply,
+                                ('server', 'motorstages'): self._on_server_motorstages_reply,
+                                ('IrradDAQBoard', 'set_ifs'): self._on_set_ifs_reply,
+                                ('interpreter', 'start'): self._on_interpreter_start_reply,
+                                ('interpreter', 'record_data'): self._on_record_data_reply,
+                                ('interpreter', 'shutdown'): self._on_interpreter_shutdown_reply,
+                                ('__scan__', 'setup_scan'): self._on_setup_scan_reply}
+
+        for motorstage in ('ScanStage', 'SetupTableStage', 'ExternalCupStage'):
+            for reply in ('set_speed', 'set_range', 'set_accel', 'stop'):
+                self._reply_handlers[(motorstage, reply)] = self._on_motorstage_set_reply
+            for reply in ('get_speed', 'get_range', 'get_accel', 'get_position'):
+                self._reply_handlers[(motorstage, reply)] = partial(self._on_motorstage_get_reply, prop=reply.split('_')[-1])
+            for reply in ('add_position', 'remove_position'):
+                self._reply_handlers[(motorstage, reply)] = partial(self._on_motorstage_position_reply, validate=reply.split('_')[0])
+            self._reply_handlers[(motorstage, 'get_physical_props')] = self._on_motorstage_props_reply
+
         # Connect signals
-        self.data_received.connect(lambda data: self.handle_data(data))
-        self.log_received.connect(lambda log: self.handle_log(log))
-        self.event_received.connect(lambda event: self.handle_event(event))
-        self.reply_received.connect(lambda reply: self.handle_reply(reply))
+        self.data_received.connect(self.handle_data_batch)
+        self.log_received.connect(self.handle_log)
+        self.event_received.connect(self.handle_event)
+        self.reply_received.connect(self.handle_reply)
+
+        # Servers for which data recording can be toggled from the DAQ dock
+        self._daq_rec_enabled = {}
+
+        # Status updates of the control tab are coalesced and applied at most every 33 ms, see _update_status
+        self._pending_status = {}
+        self._status_timer = QtCore.QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(33)
+        self._status_timer.timeout.connect(self._flush_status)
 
         # Tab widgets
         self.setup_tab = None
@@ -150,7 +222,7 @@ class IrradGUI(QtWidgets.QMainWindow):
             if name == 'Setup':
                 self.setup_tab = IrradSetupTab(parent=self)
                 self.setup_tab.session_setup.setup_widgets['session'].widgets['logging_combo'].currentTextChanged.connect(lambda lvl: self.log_widget.change_level(lvl))
-                self.setup_tab.setupCompleted.connect(lambda setup: self._init_setup(setup))
+                self.setup_tab.setupCompleted.connect(self._init_setup)
                 tw[name] = self.setup_tab
             else:
                 tw[name] = QtWidgets.QWidget()
@@ -162,10 +234,22 @@ class IrradGUI(QtWidgets.QMainWindow):
 
         # Store setup
         self.setup = setup
+        self._expected_daq_hosts = set(setup['server']) | {'localhost'}
+
+        # Addresses of the data, event and log streams of all servers and the interpreter
+        self._stream_addrs = {stream: [self._tcp_addr(setup['server'][server]['ports'][stream], ip=server) for server in setup['server']]
+                                      + [self._tcp_addr(setup['ports'][stream], ip='localhost')]
+                              for stream in ('data', 'event', 'log')}
 
         # Adjust logging level
         logging.getLogger().setLevel(setup['session']['loglevel'])
 
+        # One IO thread per server we receive streams from; the context is created here since IO threads are fixed once it is started
+        self.context = zmq.Context.instance(io_threads=max(1, len(setup['server'])))
+
+        # Each server blocks a thread while configuring and up to two while starting; leave room for commands on top
+        self.threadpool.setMaxThreadCount(max(self.threadpool.maxThreadCount(), 2 * len(setup['server']) + 4))
+
         # Update tab widgets accordingly
         self.update_tabs()
 
@@ -227,13 +311,25 @@ class IrradGUI(QtWidgets.QMainWindow):
         # Add to main layout
         self.sub_splitter.addWidget(self.daq_dock)
 
+        # Connect record buttons once; whether clicking does something is decided by _enable_daq_rec
+        for server, btn in self.daq_info_widget.record_btns.items():
+            btn.clicked.connect(lambda _, _server=server: self._record_clicked(server=_server))
+
+    def _enable_daq_rec(self, server, enable):
+        """Shows and enables the record button of *server* in the DAQ dock"""
+        self._daq_rec_enabled[server] = enable
+        self.daq_info_widget.record_btns[server].setVisible(enable)
+
+    def _record_clicked(self, server):
+        if self._daq_rec_enabled.get(server, False):
+            self.send_cmd(hostname='localhost',
+                          target='interpreter',
+                          cmd='record_data',
+                          cmd_data=(server, self.daq_info_widget.record_btns[server].text() == 'Resume'))
+
     def _init_logging(self, loglevel=logging.INFO):
         """Initializes a custom logging handler and redirects stdout/stderr"""
 
-        # Store loglevel of remote processes; subprocesses send log level and message separately
-        self._remote_loglevel = 0
-        self._loglevel_names = [lvl for lvl in log_levels if isinstance(lvl, str)]
-
         # Set logging level
         logging.getLogger().setLevel(loglevel)
 
@@ -243,84 +339,95 @@ class IrradGUI(QtWidgets.QMainWindow):
         # Add custom logger
         logging.getLogger().addHandler(self.logger)
 
+        # Log levels by their names as they appear in the topic frame of remote log messages
+        self._log_topic_levels = {name.encode(): level for name, level in log_levels.items() if isinstance(name, str)}
+
         # Connect logger signal to logger console
-        LoggingStream.stdout().messageWritten.connect(lambda msg: self.log_widget.write_log(msg))
-        LoggingStream.stderr().messageWritten.connect(lambda msg: self.log_widget.write_log(msg))
+        LoggingStream.stdout().messageWritten.connect(self.log_widget.write_log)
+        LoggingStream.stderr().messageWritten.connect(self.log_widget.write_log)
         
         logging.info('Started "irrad_control" on %s' % platform.system())
 
+    @QtCore.pyqtSlot(dict)
     def handle_log(self, log_dict):
 
-        if 'level' in log_dict:
-            self._remote_loglevel = log_dict['level']
-
-        elif 'log' in log_dict:
-            logging.log(level=self._remote_loglevel, msg=log_dict['log'])
+        # Only log if the remote level passes the level of the GUI; it may have been changed since the message was received
+        if logging.getLogger().isEnabledFor(log_dict['level']):
+            logging.log(level=log_dict['level'], msg=log_dict['log'])
 
-    def _init_recv_threads(self):
+    def _init_recv_thread(self):
 
-        # Start receiving data, events and log messages from other processes
-        for recv_func in (self.recv_data, self.recv_event, self.recv_log):
-            self.threadpool.start(QtWorker(func=recv_func))
+        # Start receiving data, events and log messages from other processes; runs outside of the QThreadPool
+        self._recv_thread = Thread(target=self.recv_streams, name='recv_streams', daemon=True)
+        self._recv_thread.start()
 
     def _init_processes(self):
 
-        # Loop over all server(s), connect to the server(s) and launch worker for configuration
-        server_config_workers = {}
+        # Loop over all server(s) and connect to the server(s)
         for server in self.setup['server']:
-            # Connect
             self.proc_mngr.connect_to_server(hostname=server, username='pi')
 
-            # Prepare server in QThread on init
-            server_config_workers[server] = QtWorker(func=self.proc_mngr.configure_server,
-                                                     hostname=server,
-                                                     branch=get_current_git_branch(),
-                                                     git_pull=True)
+        # Prepare all servers in one QThread on init
+        server_config_worker = QtWorker(func=self._configure_servers)
 
-            # Connect workers finish signal to starting process on server
-            server_config_workers[server].signals.finished.connect(lambda _server=server: self.start_server(_server))
+        # Connect workers finish signal to starting processes on all servers
+        server_config_worker.signals.finished.connect(self.start_servers)
 
-            # Connect workers exception to log
-            self._connect_worker_exception(worker=server_config_workers[server])
+        # Connect workers exception to log
+        self._connect_worker_exception(worker=server_config_worker)
 
-            # Launch worker on QThread
-            self.threadpool.start(server_config_workers[server])
+        # Launch worker on QThread
+        self.threadpool.start(server_config_worker)
 
         self.start_interpreter()
 
         self._procs_launched = True
 
+    def _configure_servers(self):
+        """Configures all servers concurrently and returns once all of them are done"""
+
+        # Servers check out the branch of the host PC
+        branch = get_current_git_branch()
+
+        with ThreadPoolExecutor(max_workers=len(self.setup['server'])) as executor:
+            # Consume results in order to re-raise exceptions which occurred during configuration
+            list(executor.map(lambda server: self.proc_mngr.configure_server(hostname=server, branch=branch, git_pull=True), self.setup['server']))
+
     def _started_daq_proc(self, hostname):
         """A DQAProcess has been sucessfully started on *hostname*"""
         
-        self._started_daq_proc_hostnames.append(hostname)
+        self._started_daq_proc_hostnames.add(hostname)
 
         # Enable Control and Monitor tabs for this
         if hostname in self.setup['server']:
             self.control_tab.enable_control(server=hostname)
             self.monitor_tab.enable_monitor(server=hostname)
 
-        # All servers have launched successfully
-        if all(s in self._started_daq_proc_hostnames for s in self.setup['server']):
-            # The interpreter has also succesfully started
-            if 'localhost' in self._started_daq_proc_hostnames:
+        # All servers and the interpreter have launched successfully
+        if self._expected_daq_hosts <= self._started_daq_proc_hostnames:
+
+            # The application has started succesfully
+            logging.info("All servers and the converter have started successfully!")
+            self.pdiag.setLabelText('Application launched successfully!')
+            self.tabs.setCurrentIndex(self.tabs.indexOf(self.monitor_tab))
+            QtCore.QTimer.singleShot(1500, self.pdiag.close)
+
+    def collect_proc_infos(self, min_wait=0.1, max_wait=1):
+        """Run in a separate thread to collect infos of all launched processes. Only processes which have not
+        registered yet are queried; the wait in between queries grows from *min_wait* to *max_wait* seconds"""
 
-                # The application has started succesfully
-                logging.info("All servers and the converter have started successfully!")
-                self.pdiag.setLabelText('Application launched successfully!')
-                self.tabs.setCurrentIndex(self.tabs.indexOf(self.monitor_tab))
-                QtCore.QTimer.singleShot(1500, self.pdiag.close)
+        wait = min_wait
 
-    def collect_proc_infos(self):
-        """Run in a separate thread to collect infos of all launched processes"""
+        # Processes which have not yet written their pid-file
+        pending = [proc for proc in self.proc_mngr.launched_procs if proc not in self.proc_mngr.active_pids]
 
-        while len(self.proc_mngr.active_pids) != len(self.proc_mngr.launched_procs):
+        while pending:
 
-            for proc in self.proc_mngr.launched_procs:
+            for proc in pending:
 
                 proc_info = self.proc_mngr.get_irrad_proc_info(proc)
 
-                if proc_info is not None and proc not in self.proc_mngr.active_pids:
+                if proc_info is not None:
                     self.proc_mngr.register_pid(hostname=proc, pid=proc_info['pid'], name=proc_info['name'], ports=proc_info['ports'])
 
                     # Update setup
@@ -329,8 +436,15 @@ class IrradGUI(QtWidgets.QMainWindow):
                     else:
                         self.setup['ports'] = proc_info['ports']
 
-            # Wait a second before trying to read something again
-            time.sleep(1)
+            pending = [proc for proc in pending if proc not in self.proc_mngr.active_pids]
+
+            # All processes registered; return immediately
+            if not pending:
+                break
+
+            # Wait before trying to read something again
+            time.sleep(wait)
+            wait = min(2 * wait, max_wait)
 
     def send_start_cmd(self):
 
@@ -361,13 +475,10 @@ class IrradGUI(QtWidgets.QMainWindow):
             self.proc_mngr.launched_procs.append(hostname)
 
             # Check if all servers and converter have been launched; if so start collecting process info and send start cmd
-            servers_launched = all(server in self.proc_mngr.launched_procs for server in self.setup['server'])
-            converter_launched = 'localhost' in self.proc_mngr.launched_procs
-
             # Servers AND converter need to be launched before collecting infos for event distribution 
-            if servers_launched and converter_launched:
+            if self._expected_daq_hosts.issubset(self.proc_mngr.launched_procs):
                 proc_info_worker = QtWorker(func=self.collect_proc_infos)
-                proc_info_worker.signals.finished.connect(self._init_recv_threads)
+                proc_info_worker.signals.finished.connect(self._init_recv_thread)
                 proc_info_worker.signals.finished.connect(self.send_start_cmd)
                 self.threadpool.start(proc_info_worker)
 
@@ -399,6 +510,10 @@ class IrradGUI(QtWidgets.QMainWindow):
     def start_server(self, server):
         self._start_daq_proc(hostname=server)
 
+    def start_servers(self):
+        for server in self.setup['server']:
+            self.start_server(server)
+
     def start_interpreter(self):
         self._start_daq_proc(hostname='localhost')
 
@@ -420,14 +535,7 @@ class IrradGUI(QtWidgets.QMainWindow):
 
         # Connect control tab
         self.control_tab.sendCmd.connect(lambda cmd_dict: self.send_cmd(**cmd_dict))
-        self.control_tab.enableDAQRec.connect(lambda server, enable: self.daq_info_widget.record_btns[server].setVisible(enable))
-        self.control_tab.enableDAQRec.connect(
-            lambda server, enable: self.daq_info_widget.record_btns[server].clicked.connect(
-                lambda _, _server=server: self.send_cmd(hostname='localhost',
-                                                        target='interpreter',
-                                                        cmd='record_data',
-                                                        cmd_data=(_server, self.daq_info_widget.record_btns[server].text() == 'Resume')))
-            if enable else self.daq_info_widget.record_btns[server].clicked.disconnect())  # Pretty crazy connection. Basically connects or disconnects a button
+        self.control_tab.enableDAQRec.connect(self._enable_daq_rec)
 
         # Make temporary dict for updated tabs
         tmp_tw = {'Control': self.control_tab, 'Monitor': self.monitor_tab}
@@ -442,162 +550,256 @@ class IrradGUI(QtWidgets.QMainWindow):
         # Set the tab index to stay at the same tab after replacing old tabs
         self.tabs.setCurrentIndex(current_tab)
 
+    @QtCore.pyqtSlot(dict)
     def handle_event(self, event_data):
         event_data['server'] = self.setup['server'][event_data['server']]['name']
         self.event_widget.register_event(event_dict=event_data)
     
-    def handle_data(self, data):
+    @QtCore.pyqtSlot(list)
+    def handle_data_batch(self, batch):
+        """Handles a *batch* of data, as received at once from the data stream, in order of arrival"""
+        for data in batch:
+            self.handle_data(data)
 
-        server = data['meta']['name']
-
-        # Check whether data is interpreted
-        if data['meta']['type'] == 'raw':
-            self.daq_info_widget.update_raw_data(data)
-            self.monitor_tab.plots[server]['raw_plot'].set_data(meta=data['meta'], data=data['data'])
-
-        # Check whether data is interpreted
-        elif data['meta']['type'] == 'beam':
-            self.daq_info_widget.update_beam_current(data)
-            self.monitor_tab.plots[server]['pos_plot'].set_data(data)
-            self.monitor_tab.plots[server]['current_plot'].set_data(meta=data['meta'], data=data['data']['current'])
-            self.monitor_tab.plots[server]['see_current_plot'].set_data(meta=data['meta'], data=data['data']['see'])
-
-            if 'sey' in data['data']['see']:
-                self.monitor_tab.plots[server]['sey_plot'].set_data(data['data']['see']['sey'])
-            if 'frac_h' in data['data']['see']:
-                self.monitor_tab.plots[server]['sem_h_plot'].set_data(data['data']['see']['frac_h'])
-            if 'frac_v' in data['data']['see']:
-                self.monitor_tab.plots[server]['sem_v_plot'].set_data(data['data']['see']['frac_v'])
-
-        elif data['meta']['type'] == 'hist':
-            if 'beam_position_idxs' in data['data']:
-                self.monitor_tab.plots[server]['pos_plot'].update_hist(data['data']['beam_position_idxs'])
-            if 'see_horizontal_idx' in data['data']:
-                self.monitor_tab.plots[server]['sem_h_plot'].update_hist(data['data']['see_horizontal_idx'])
-            if 'see_vertical_idx' in data['data']:
-                self.monitor_tab.plots[server]['sem_v_plot'].update_hist(data['data']['see_vertical_idx'])
-            if 'sey_idx' in data['data']:
-                self.monitor_tab.plots[server]['sey_plot'].update_hist(data['data']['sey_idx'])
-
-        elif data['meta']['type'] == 'damage':
-            self.control_tab.tab_widgets[server]['status'].update_status(status='damage', status_values=data['data'])
-
-        elif data['meta']['type'] == 'scan':
-
-            if data['data']['status'] == 'scan_init':  # Scan is being initialized
-
-                # Disable all record buttons when scan starts
-                self.control_tab.tab_widgets[server]['daq'].btn_record.setEnabled(False)
-                self.daq_info_widget.record_btns[server].setEnabled(False)
-                self.control_tab.tab_widgets[server]['scan'].enable_after_scan_ui(False)
-
-            elif data['data']['status'] in ('scan_start', 'scan_stop'):
-
-                self.control_tab.tab_widgets[server]['status'].update_status(status='scan',
-                                                                             status_values=data['data'],
-                                                                             ignore_status=('speed',
-                                                                                            'accel',
-                                                                                            'x_start',
-                                                                                            'x_stop',
-                                                                                            'y_start',
-                                                                                            'y_stop'))
-
-            elif data['data']['status'] in ('scan_row_initiated', 'scan_row_completed'):
-
-                # We are scanning individual rows
-                if data['data']['scan'] == -1:
-                    enable = data['data']['status'] == 'scan_row_completed'
-                    self.control_tab.tab_widgets[server]['scan'].enable_after_scan_ui(enable)
-                    self.control_tab.scan_status(server=server, status='started' if not enable else 'stopped')
-                    self.control_tab.tab_widgets[server]['scan'].scan_in_progress = not enable
-
-            elif data['data']['status'] == 'scan_finished':
-                self.control_tab.scan_status(server=server, status=data['data']['status'])
-
-                # Enable all record buttons when scan is over
-                self.control_tab.tab_widgets[server]['daq'].btn_record.setEnabled(True)
-                self.daq_info_widget.record_btns[server].setEnabled(True)
-                self.control_tab.tab_widgets[server]['scan'].init_after_scan_ui()
-                self.control_tab.tab_widgets[server]['scan'].scan_in_progress = False
-                self.control_tab.tab_widgets[server]['scan'].enable_after_scan_ui(True)
-
-                # Check whether data is interpreted
-            elif data['data']['status'] == 'interpreted':
-                self.monitor_tab.plots[server]['fluence_plot'].set_data(data)
-                
-                self.control_tab.tab_widgets[server]['status'].update_status(status='scan',
-                                                                             status_values=data['data'],
-                                                                             ignore_status=('fluence_hist',
-                                                                                            'fluence_hist_err',
-                                                                                            'status'))
-
-        elif data['meta']['type'] == 'temp_arduino':
-
-            self.monitor_tab.plots[server]['temp_arduino_plot'].set_data(meta=data['meta'], data=data['data'])
-
-        elif data['meta']['type'] == 'temp_daq_board':
-            self.monitor_tab.plots[server]['temp_daq_board_plot'].set_data(meta=data['meta'], data=data['data'])
-
-        elif data['meta']['type'] == 'dose_rate':
-            self.monitor_tab.plots[server]['dose_rate_plot'].set_data(meta=data['meta'], data=data['data'])
-            
-        elif data['meta']['type'] == 'axis':
-            self.control_tab.tab_widgets[server]['status'].update_status(status=data['data']['axis_domain'],
-                                                                         status_values=data['data'],
-                                                                         ignore_status=('axis_domain',))
-            # Update motorstage positions after every move
-            self.control_tab.tab_widgets[server]['motorstage'].update_motorstage_properties(motorstage=data['data']['axis_domain'],
-                                                                                            properties={'position': data['data']['position']},
-                                                                                            axis=data['data']['axis'])
+    def handle_data(self, data):
+        """Dispatches *data* to the handler of its type; data of unknown type is ignored"""
+        self._data_handlers.get(data['meta']['type'], self._on_unknown_data)(data, data['meta']['name'])
+
+    def _on_unknown_data(self, data, server):
+        pass
+
+    def _on_raw_data(self, data, server):
+        self.daq_info_widget.update_raw_data(data)
+        self.monitor_tab.plots[server]['raw_plot'].set_data(meta=data['meta'], data=data['data'])
+
+    def _on_beam_data(self, data, server):
+        plots = self.monitor_tab.plots[server]
+        meta, see = data['meta'], data['data']['see']
+
+        self.daq_info_widget.update_beam_current(data)
+        plots['pos_plot'].set_data(data)
+        plots['current_plot'].set_data(meta=meta, data=data['data']['current'])
+        plots['see_current_plot'].set_data(meta=meta, data=see)
+
+        if 'sey' in see:
+            plots['sey_plot'].set_data(see['sey'])
+        if 'frac_h' in see:
+            plots['sem_h_plot'].set_data(see['frac_h'])
+        if 'frac_v' in see:
+            plots['sem_v_plot'].set_data(see['frac_v'])
+
+    def _on_hist_data(self, data, server):
+        plots = self.monitor_tab.plots[server]
+        d = data['data']
+
+        if 'beam_position_idxs' in d:
+            plots['pos_plot'].update_hist(d['beam_position_idxs'])
+        if 'see_horizontal_idx' in d:
+            plots['sem_h_plot'].update_hist(d['see_horizontal_idx'])
+        if 'see_vertical_idx' in d:
+            plots['sem_v_plot'].update_hist(d['see_vertical_idx'])
+        if 'sey_idx' in d:
+            plots['sey_plot'].update_hist(d['sey_idx'])
+
+    def _on_damage_data(self, data, server):
+        self._update_status(server=server, status='damage', status_values=data['data'])
+
+    def _on_scan_data(self, data, server):
+        tw = self.control_tab.tab_widgets[server]
+        d = data['data']
+
+        if d['status'] == 'scan_init':  # Scan is being initialized
+
+            # Disable all record buttons when scan starts
+            tw['daq'].btn_record.setEnabled(False)
+            self.daq_info_widget.record_btns[server].setEnabled(False)
+            tw['scan'].enable_after_scan_ui(False)
+
+        elif d['status'] in ('scan_start', 'scan_stop'):
+
+            self._update_status(server=server,
+                                status='scan',
+                                status_values=d,
+                                ignore_status=('speed', 'accel', 'x_start', 'x_stop', 'y_start', 'y_stop'))
+
+        elif d['status'] in ('scan_row_initiated', 'scan_row_completed'):
+
+            # We are scanning individual rows
+            if d['scan'] == -1:
+                enable = d['status'] == 'scan_row_completed'
+                tw['scan'].enable_after_scan_ui(enable)
+                self.control_tab.scan_status(server=server, status='started' if not enable else 'stopped')
+                tw['scan'].scan_in_progress = not enable
+
+        elif d['status'] == 'scan_finished':
+            self.control_tab.scan_status(server=server, status=d['status'])
+
+            # Enable all record buttons when scan is over
+            tw['daq'].btn_record.setEnabled(True)
+            self.daq_info_widget.record_btns[server].setEnabled(True)
+            tw['scan'].init_after_scan_ui()
+            tw['scan'].scan_in_progress = False
+            tw['scan'].enable_after_scan_ui(True)
+
+            # Check whether data is interpreted
+        elif d['status'] == 'interpreted':
+            self.monitor_tab.plots[server]['fluence_plot'].set_data(data)
             
+            self._update_status(server=server,
+                                status='scan',
+                                status_values=d,
+                                ignore_status=('fluence_hist', 'fluence_hist_err', 'status'))
+
+    def _update_status(self, server, status, status_values, ignore_status=(), only_status='all'):
+        """Queues an update of the control tab status widget of *server*; updates are applied by *_flush_status*.
+        Multiple updates of the same status in between are merged, keeping the latest value per status entry."""
+
+        key = (server, status, ignore_status, only_status)
+
+        # Merge into the pending values of this status; a fresh dict so the caller's *status_values* is not mutated
+        self._pending_status.setdefault(key, {}).update(status_values)
+
+        if not self._status_timer.isActive():
+            self._status_timer.start()
+
+    def _flush_status(self):
+        """Applies all pending status updates to the control tab"""
+
+        pending_status, self._pending_status = self._pending_status, {}
+
+        for (server, status, ignore_status, only_status), status_values in pending_status.items():
+            self.control_tab.tab_widgets[server]['status'].update_status(status=status,
+                                                                         status_values=status_values,
+                                                                         ignore_status=ignore_status,
+                                                                         only_status=only_status)
+
+    def _on_temp_arduino_data(self, data, server):
+        self.monitor_tab.plots[server]['temp_arduino_plot'].set_data(meta=data['meta'], data=data['data'])
+
+    def _on_temp_daq_board_data(self, data, server):
+        self.monitor_tab.plots[server]['temp_daq_board_plot'].set_data(meta=data['meta'], data=data['data'])
+
+    def _on_dose_rate_data(self, data, server):
+        self.monitor_tab.plots[server]['dose_rate_plot'].set_data(meta=data['meta'], data=data['data'])
+
+    def _on_axis_data(self, data, server):
+        d = data['data']
+
+        self._update_status(server=server, status=d['axis_domain'], status_values=d, ignore_status=('axis_domain',))
+        # Update motorstage positions after every move
+        self.control_tab.tab_widgets[server]['motorstage'].update_motorstage_properties(motorstage=d['axis_domain'],
+                                                                                        properties={'position': d['position']},
+                                                                                        axis=d['axis'])
+
     def send_cmd(self, hostname, target, cmd, cmd_data=None, timeout=5):
         """Send a command *cmd* to a target *target* running within the server or interpreter process.
         The command can have respective data *cmd_data*."""
 
         cmd_dict = {'target': target, 'cmd': cmd, 'data': cmd_data}
-        cmd_worker = QtWorker(self._send_cmd_get_reply, hostname, cmd_dict, timeout)
 
-        # Make connections
-        self._connect_worker_exception(worker=cmd_worker)
+        # Hand the command to the dispatcher thread of the host
+        self._get_cmd_queue(hostname=hostname).put((cmd_dict, timeout))
+
+    def send_cmd_batch(self, hostname, target, cmds, timeout=5):
+        """Send a batch of commands *cmds* to a target *target* within a single request. *cmds* is a list of dicts
+        with 'cmd' and optionally 'data' fields. The commands are handled in order and each reply is emitted individually."""
+        self.send_cmd(hostname=hostname, target=target, cmd='batch', cmd_data=cmds, timeout=timeout)
+
+    def _get_cmd_queue(self, hostname):
+        """Returns the command queue of *hostname*; the dispatcher thread of the host is started on first request"""
+
+        with self._cmd_lock:
+
+            if hostname not in self._cmd_queues:
+                self._cmd_queues[hostname] = SimpleQueue()
+                self._cmd_dispatchers[hostname] = Thread(target=self._dispatch_cmds, args=(hostname, self._cmd_queues[hostname]), name=f'cmd_{hostname}', daemon=True)
+                self._cmd_dispatchers[hostname].start()
+
+            return self._cmd_queues[hostname]
+
+    def _dispatch_cmds(self, hostname, cmd_queue):
+        """Sends the commands put into *cmd_queue* to *hostname* one after another until None is put.
+        Afterwards, the command socket of *hostname* is closed"""
+
+        for cmd_dict, timeout in iter(cmd_queue.get, None):
+            try:
+                self._send_cmd_get_reply(hostname=hostname, cmd_dict=cmd_dict, timeout=timeout)
+            except Exception as e:
+                logging.error("{} on sub-thread: {}".format(type(e).__name__, traceback.format_exc()))
+
+        with self._cmd_lock:
+            cmd_sock, cmd_sock_lock = self._cmd_sockets.pop(hostname, None), self._cmd_locks.get(hostname)
+
+        if cmd_sock is not None:
+            with cmd_sock_lock:
+                cmd_sock.close()
 
-        # Start
-        self.threadpool.start(cmd_worker)
+    def _get_cmd_socket(self, hostname):
+        """Returns the persistent DEALER socket to *hostname* and the lock serializing its use; created on first request"""
+
+        with self._cmd_lock:
+
+            if hostname not in self._cmd_sockets:
+
+                cmd_port = self.setup['server'][hostname]['ports']['cmd'] if hostname in self.setup['server'] else self.setup['ports']['cmd']
+
+                dealer = self.context.socket(zmq.DEALER)
+                dealer.setsockopt(zmq.LINGER, 0)
+
+                # Detect silently dropped connections to remote hosts instead of only running into the reply timeout
+                dealer.setsockopt(zmq.TCP_KEEPALIVE, 1)
+                dealer.setsockopt(zmq.TCP_KEEPALIVE_IDLE, 30)
+                dealer.connect(self._tcp_addr(cmd_port, hostname))
+
+                self._cmd_sockets[hostname] = dealer
+                self._cmd_locks[hostname] = Lock()
+
+            return self._cmd_sockets[hostname], self._cmd_locks[hostname]
 
     def _send_cmd_get_reply(self, hostname, cmd_dict, timeout=None):
         """Sending a command to the server / interpreter and waiting for its reply. This runs on a separate QThread due
         to the blocking nature of the recv() method of sockets. *cmd_dict* contains the target, cmd and cmd_data."""
 
-        # Spawn socket to send request to server / interpreter and connect
-        req = self.context.socket(zmq.REQ)
-        req_port = self.setup['server'][hostname]['ports']['cmd'] if hostname in self.setup['server'] else self.setup['ports']['cmd']
+        # Get persistent socket to server / interpreter; sockets are not threadsafe, so only one command per host at a time
+        dealer, dealer_lock = self._get_cmd_socket(hostname=hostname)
 
-        if timeout:
-            req.setsockopt(zmq.RCVTIMEO, int(timeout * 1000))
-            req.setsockopt(zmq.LINGER, 0)  # Required if RCVTIMEO is used
+        # Request id is sent as envelope frame which the receiving ROUTER socket returns with the reply
+        rid = str(next(self._cmd_rid)).encode()
 
-        req.connect(self._tcp_addr(req_port, hostname))
+        with dealer_lock:
 
-        # Send command dict and wait for reply
-        req.send_json(cmd_dict)
+            dealer.setsockopt(zmq.RCVTIMEO, int(timeout * 1000) if timeout else -1)
 
-        try:
-            reply = req.recv_json()
+            # Send command dict, with empty delimiter frame like a REQ socket, and wait for reply; large payloads e.g. the setup are not copied
+            dealer.send_multipart([rid, b'', dumps_json(cmd_dict)], copy=False)
 
-            # Update reply dict by the servers IP address
-            reply['hostname'] = hostname
+            try:
+                # Discard late replies to commands which timed out before
+                reply_rid = None
+                while reply_rid != rid:
+                    reply_rid, _, reply = dealer.recv_multipart()
 
-            # Emit the received reply in pyqt signal and close socket
-            self.reply_received.emit(reply)
+                reply = loads_json(reply)
 
-        except zmq.Again:
-            msg = "Command '{}' with target '{}' timed out after {} seconds: no reply from server '{}'"
-            logging.error(msg.format(cmd_dict['cmd'],
-                                     cmd_dict['target'],
-                                     timeout,
-                                     'localhost' if hostname not in self.setup['server'] else self.setup['server'][hostname]['name']))
-        finally:
-            req.close()
+                # Replies to a command batch contain the replies of the individual commands
+                replies = reply.get('data', []) if reply['reply'] == 'batch' else [reply]
 
+                for r in replies:
+
+                    # Update reply dict by the servers IP address
+                    r['hostname'] = hostname
+
+                    # Emit the received reply in pyqt signal
+                    self.reply_received.emit(r)
+
+            except zmq.Again:
+                msg = "Command '{}' with target '{}' timed out after {} seconds: no reply from server '{}'"
+                logging.error(msg.format(cmd_dict['cmd'],
+                                         cmd_dict['target'],
+                                         timeout,
+                                         'localhost' if hostname not in self.setup['server'] else self.setup['server'][hostname]['name']))
+
+    @QtCore.pyqtSlot(dict)
     def handle_reply(self, reply_dict):
 
         reply = reply_dict['reply']
@@ -608,151 +810,187 @@ class IrradGUI(QtWidgets.QMainWindow):
 
         if _type == 'STANDARD':
 
-            if sender == 'server':
-
-                if reply == 'start':
-                    logging.info("Successfully started server on at IP {} with PID {}".format(hostname, reply_data))
-                    self._started_daq_proc(hostname=hostname)
+            # Dispatch to the handler of this reply; replies without handler are only logged
+            self._reply_handlers.get((sender, reply), self._on_unknown_reply)(hostname, sender, reply, reply_data)
 
-                    # Get initial motorstage configuration
-                    self.send_cmd(hostname=hostname, target=sender, cmd='motorstages')
+            # Debug; only formatted if debug messages are logged
+            logging.debug("Standard %s reply received: '%s' with data '%s'", sender, reply, reply_data)
 
-                elif reply == 'shutdown':
+        elif _type == 'ERROR':
+            msg = "{} error occurred: '{}' with data '{}'".format(sender, reply, reply_data)
+            logging.error(msg)
+            if self.info_dock.isHidden():
+                self.info_dock.setVisible(True)
 
-                    logging.info("Server at {} confirmed shutdown".format(hostname))
+        else:
+            logging.info("Received reply '{}' from '{}' with data '{}'".format(reply, sender, reply_data))
 
-                elif reply == 'motorstages':
-                    for ms, ms_config in reply_data.items():
-                        self.control_tab.tab_widgets[hostname]['motorstage'].add_motorstage(motorstage=ms,
-                                                                                            positions=ms_config['positions'],
-                                                                                            properties=ms_config['props'])
+    def _on_unknown_reply(self, hostname, sender, reply, reply_data):
+        pass
 
-            elif sender == 'IrradDAQBoard':
+    def _on_server_start_reply(self, hostname, sender, reply, reply_data):
+        logging.info("Successfully started server on at IP {} with PID {}".format(hostname, reply_data))
+        self._started_daq_proc(hostname=hostname)
 
-                if reply == 'set_ifs':
-                    cmd_data = {'server': hostname,
-                                'ifs': reply_data['callback']['result'],
-                                'group': reply_data['call']['kwargs']['group']}
-                    self.send_cmd(hostname='localhost', target='interpreter', cmd='update_group_ifs', cmd_data=cmd_data)
-                    self.send_cmd(hostname='localhost', target='interpreter', cmd='record_data', cmd_data=(hostname, True))
+        # Get initial motorstage configuration
+        self.send_cmd(hostname=hostname, target=sender, cmd='motorstages')
 
-            elif sender == 'interpreter':
+    def _on_server_shutdown_reply(self, hostname, sender, reply, reply_data):
+        logging.info("Server at {} confirmed shutdown".format(hostname))
 
-                if reply == 'start':
-                    logging.info("Successfully started interpreter on {} with PID {}".format(hostname, reply_data))
-                    self._started_daq_proc(hostname=hostname)
+    def _on_server_motorstages_reply(self, hostname, sender, reply, reply_data):
+        motorstage_widget = self.control_tab.tab_widgets[hostname]['motorstage']
+        for ms, ms_config in reply_data.items():
+            motorstage_widget.add_motorstage(motorstage=ms, positions=ms_config['positions'], properties=ms_config['props'])
 
-                if reply == 'record_data':
-                    server, state = reply_data
-                    self.daq_info_widget.update_rec_state(server=server, state=state)
-                    self.control_tab.update_rec_state(server=server, state=state)
+    def _on_set_ifs_reply(self, hostname, sender, reply, reply_data):
+        cmd_data = {'server': hostname,
+                    'ifs': reply_data['callback']['result'],
+                    'group': reply_data['call']['kwargs']['group']}
+        self.send_cmd_batch(hostname='localhost', target='interpreter', cmds=[{'cmd': 'update_group_ifs', 'data': cmd_data},
+                                                                             {'cmd': 'record_data', 'data': (hostname, True)}])
 
-                if reply == 'shutdown':
+    def _on_interpreter_start_reply(self, hostname, sender, reply, reply_data):
+        logging.info("Successfully started interpreter on {} with PID {}".format(hostname, reply_data))
+        self._started_daq_proc(hostname=hostname)
 
-                    logging.info("Interpreter confirmed shutdown")
+    def _on_record_data_reply(self, hostname, sender, reply, reply_data):
+        server, state = reply_data
+        self.daq_info_widget.update_rec_state(server=server, state=state)
+        self.control_tab.update_rec_state(server=server, state=state)
 
-            elif sender == '__scan__':
+    def _on_interpreter_shutdown_reply(self, hostname, sender, reply, reply_data):
+        logging.info("Interpreter confirmed shutdown")
 
-                if reply == 'setup_scan':
-                    self.monitor_tab.add_fluence_hist(server=hostname,
-                                                      kappa=self.setup['server'][hostname]['daq']['kappa']['nominal'],
-                                                      n_rows=reply_data['result']['n_rows'])
-                    
-                    self.control_tab.scan_status(server=hostname, status='started')
-                    self.control_tab.tab_widgets[hostname]['scan'].enable_after_scan_ui(False)
-                    self.control_tab.tab_widgets[hostname]['scan'].n_rows = reply_data['result']['n_rows']
-                    self.control_tab.tab_widgets[hostname]['scan'].launch_scan()
-                    self.control_tab.tab_widgets[hostname]['scan'].scan_in_progress = True
+    def _on_setup_scan_reply(self, hostname, sender, reply, reply_data):
+        scan_result = reply_data['result']
+        scan_widget = self.control_tab.tab_widgets[hostname]['scan']
 
-                    self.control_tab.tab_widgets[hostname]['status'].update_status(status='scan',
-                                                                                   status_values=reply_data['result'],
-                                                                                   only_status=('n_rows',))
+        self.monitor_tab.add_fluence_hist(server=hostname,
+                                          kappa=self.setup['server'][hostname]['daq']['kappa']['nominal'],
+                                          n_rows=scan_result['n_rows'])
 
-            # Get motorstage responses
-            elif sender in ('ScanStage', 'SetupTableStage', 'ExternalCupStage'):
+        self.control_tab.scan_status(server=hostname, status='started')
+        scan_widget.enable_after_scan_ui(False)
+        scan_widget.n_rows = scan_result['n_rows']
+        scan_widget.launch_scan()
+        scan_widget.scan_in_progress = True
 
-                if reply in ('set_speed', 'set_range', 'set_accel', 'stop'):
-                    # Callback is get_physical_props
-                    self.control_tab.tab_widgets[hostname]['motorstage'].update_motorstage_properties(motorstage=sender,
-                                                                                                      properties=reply_data['callback']['result'])
-                elif reply in ['get_speed', 'get_range', 'get_accel', 'get_position']:
-                    prop = reply.split('_')[-1]
-                    prop = {prop: reply_data['result']} if not isinstance(reply_data['result'], list) else [{prop: r} for r in reply_data['result']]
-                    self.control_tab.tab_widgets[hostname]['motorstage'].update_motorstage_properties(motorstage=sender,
-                                                                                                      properties=prop)
-                elif reply == 'get_physical_props':
-                    self.control_tab.tab_widgets[hostname]['motorstage'].update_motorstage_properties(motorstage=sender,
-                                                                                                      properties=reply_data['result'])
+        self._update_status(server=hostname, status='scan', status_values=scan_result, only_status=('n_rows',))
 
-                elif reply in ('add_position', 'remove_position'):
-                    self.control_tab.tab_widgets[hostname]['motorstage'].motorstage_positions_window.validate(motorstage=sender,
-                                                                                                              positions=reply_data['callback']['result'],
-                                                                                                              validate=reply.split('_')[0])
+    def _on_motorstage_set_reply(self, hostname, sender, reply, reply_data):
+        # Callback is get_physical_props
+        self.control_tab.tab_widgets[hostname]['motorstage'].update_motorstage_properties(motorstage=sender,
+                                                                                          properties=reply_data['callback']['result'])
 
-            # Debug
-            msg = "Standard {} reply received: '{}' with data '{}'".format(sender, reply, reply_data)
-            logging.debug(msg)
+    def _on_motorstage_get_reply(self, hostname, sender, reply, reply_data, prop):
+        result = reply_data['result']
+        properties = [{prop: r} for r in result] if isinstance(result, list) else {prop: result}
+        self.control_tab.tab_widgets[hostname]['motorstage'].update_motorstage_properties(motorstage=sender,
+                                                                                          properties=properties)
 
-        elif _type == 'ERROR':
-            msg = "{} error occurred: '{}' with data '{}'".format(sender, reply, reply_data)
-            logging.error(msg)
-            if self.info_dock.isHidden():
-                self.info_dock.setVisible(True)
+    def _on_motorstage_props_reply(self, hostname, sender, reply, reply_data):
+        self.control_tab.tab_widgets[hostname]['motorstage'].update_motorstage_properties(motorstage=sender,
+                                                                                          properties=reply_data['result'])
 
-        else:
-            logging.info("Received reply '{}' from '{}' with data '{}'".format(reply, sender, reply_data))
+    def _on_motorstage_position_reply(self, hostname, sender, reply, reply_data, validate):
+        self.control_tab.tab_widgets[hostname]['motorstage'].motorstage_positions_window.validate(motorstage=sender,
+                                                                                                  positions=reply_data['callback']['result'],
+                                                                                                  validate=validate)
 
-    def _recv_from_stream(self, stream, recv_func, emit_signal, callback=None, recv_msg=''):
+    def _create_stream_sub(self, stream):
+        """Creates a subscriber which is connected to the *stream* of all servers and the interpreter"""
 
         # Subscriber
         sub = self.context.socket(zmq.SUB)
-
-        # Wait 1 sec for messages to be received
-        sub.setsockopt(zmq.RCVTIMEO, int(1000))
         sub.setsockopt(zmq.LINGER, 0)
+        sub.setsockopt(zmq.TCP_KEEPALIVE, 1)
+        sub.setsockopt(zmq.TCP_KEEPALIVE_IDLE, 30)
 
-        # Loop over servers and connect to their data streams
-        for server in self.setup['server']:
-            sub.connect(self._tcp_addr(self.setup['server'][server]['ports'][stream], ip=server))
+        # Queue bursts of incoming messages while the GUI is busy instead of dropping them
+        sub.setsockopt(zmq.RCVHWM, 10000)
 
-        # Connect to interpreter data stream
-        sub.connect(self._tcp_addr(self.setup['ports'][stream], ip='localhost'))
+        # Connect to the streams of the servers and the interpreter
+        for addr in self._stream_addrs[stream]:
+            sub.connect(addr)
 
         sub.setsockopt(zmq.SUBSCRIBE, b'')  # specify bytes for Py3
 
-        logging.info(recv_msg or f"Start receiving from {stream} stream")
-        
-        while not self.stop_recv.is_set():
-            try:
-                res = getattr(sub, recv_func)()
-                # Only emit if we got something
-                if res:
-                    emit_signal.emit(res if callback is None else callback(res))
-            except zmq.Again:
-                pass
+        return sub
 
-    def recv_event(self):
-        self._recv_from_stream(stream='event', recv_func='recv_json', emit_signal=self.event_received)
+    def recv_streams(self, max_batch=64):
+        """Receives the data, event and log streams of all servers and the interpreter in a single thread and emits
+        the respective pyqt signals. The subscribers are polled to wait for messages on any of the streams.
+        Data is drained from its subscriber and emitted in batches of up to *max_batch* messages."""
 
-    def recv_data(self):
-        self._recv_from_stream(stream='data', recv_func='recv_json', emit_signal=self.data_received)
+        # Subscriber sockets and how to receive and emit from them; the last entry is the batch size, None if not batched
+        streams = {self._create_stream_sub(stream='data'): ('recv_json', self.data_received, None, max_batch),
+                   self._create_stream_sub(stream='event'): ('recv_json', self.event_received, None, None),
+                   self._create_stream_sub(stream='log'): ('recv_multipart', self.log_received, self._decode_log, None)}
 
-    def recv_log(self):
+        # Socket on which the stop signal is received, see _clean_up
+        stop_sock = self.context.socket(zmq.PAIR)
+        stop_sock.bind(self._stop_recv_addr)
 
-        def callback(log):
-            # Py3 compatibility; in Py 3 string is unicode, receiving log via socket will result in bytestring which needs to be decoded first;
-            # Py2 has bytes as default; interestinglyy, u'test' == 'test' is True in Py2 (whereas 'test' == b'test' is False in Py3),
-            # therefore this will work in Py2 and Py3
-            log = log.decode()
-            log_dict = {}
+        poller = zmq.Poller()
+        for sub in (*streams, stop_sock):
+            poller.register(sub, zmq.POLLIN)
 
-            if log.upper() in self._loglevel_names:
-                log_dict['level'] = getattr(logging, log.upper(), None)
-            else:
-                log_dict['log'] = log.strip()
-            return log_dict
+        logging.info("Start receiving from data, event and log streams")
+
+        while True:
+
+            # Block until messages are received on any stream or the stop signal arrives
+            events = dict(poller.poll())
+
+            if stop_sock in events:
+                break
+
+            for sub in events:
+
+                recv_func, emit_signal, callback, batch_size = streams[sub]
+
+                recv = getattr(sub, recv_func)
+
+                if batch_size is None:
+
+                    res = recv()
+
+                    if callback is not None:
+                        res = callback(res)
+
+                    # Only emit if we got something
+                    if res:
+                        emit_signal.emit(res)
+
+                    continue
+
+                # Drain all pending messages, up to the batch size, and emit them at once
+                batch = [recv()]
+                while len(batch) < batch_size:
+                    try:
+                        batch.append(recv(flags=zmq.NOBLOCK))
+                    except zmq.Again:
+                        break
+
+                emit_signal.emit([res for res in batch if res])
+
+        for sub in (*streams, stop_sock):
+            sub.close()
+
+    def _decode_log(self, frames):
+        """Decodes a log message of a remote process, consisting of a topic and a message frame, into a dict holding the log level and the message.
+        Returns None for messages below the level of the GUI."""
+
+        # The topic starts with the level name of the message; it may be followed by a sub-topic, separated by a '.'
+        topic, log = frames
+        level = self._log_topic_levels.get(topic.partition(b'.')[0], logging.INFO)
+
+        # Only decode the message if it is going to be logged
+        if not logging.getLogger().isEnabledFor(level):
+            return None
 
-        self._recv_from_stream(stream='log', recv_func='recv', emit_signal=self.log_received, callback=callback)
+        return {'level': level, 'log': log.decode().strip()}
 
     def handle_messages(self, message, ms=4000):
         """Handles messages from the tabs shown in QMainWindows statusBar"""
@@ -775,8 +1013,13 @@ class IrradGUI(QtWidgets.QMainWindow):
 
     def _clean_up(self):
 
-        # Stop receiver threads
-        self.stop_recv.set()
+        # Stop receiver thread
+        if self._recv_thread is not None:
+            stop_sock = self.context.socket(zmq.PAIR)
+            stop_sock.setsockopt(zmq.LINGER, 1000)
+            stop_sock.connect(self._stop_recv_addr)
+            stop_sock.send(b'')
+            stop_sock.close()
 
         # Store all plots on close; AttributeError when app was not launched fully
         try:
@@ -787,47 +1030,110 @@ class IrradGUI(QtWidgets.QMainWindow):
         # Wait 5 second for all threads to finish
         self.threadpool.waitForDone(5000)
 
+        if self._recv_thread is not None:
+            self._recv_thread.join(1)
+
+        # Stop command dispatchers after their queued commands; each closes the command socket of its host.
+        # Sockets of hosts which only received commands directly e.g. on shutdown get a dispatcher for closing as well
+        for hostname in list(self._cmd_sockets):
+            self._get_cmd_queue(hostname=hostname)
+
+        with self._cmd_lock:
+            for cmd_queue in self._cmd_queues.values():
+                cmd_queue.put(None)
+            dispatchers = list(self._cmd_dispatchers.values())
+
+        # Wait up to 5 seconds in total for the dispatchers to finish
+        deadline = time.time() + 5
+        for dispatcher in dispatchers:
+            dispatcher.join(max(0, deadline - time.time()))
+
+    def _shutdown_daq_procs(self, hosts, timeout=None):
+        """Sends the shutdown command to the DAQProcesses on all *hosts* concurrently and returns once all of them
+        replied or timed out, taking as long as the slowest host"""
+
+        def shutdown(host):
+            self._send_cmd_get_reply(hostname=host,
+                                     cmd_dict={'target': 'interpreter' if host == 'localhost' else 'server', 'cmd': 'shutdown'},
+                                     timeout=timeout)
+
+        with ThreadPoolExecutor(max_workers=max(1, len(hosts))) as executor:
+            # Consume results in order to re-raise exceptions which occurred during shutdown
+            list(executor.map(shutdown, hosts))
+
     def _validate_close(self):
 
         # If all servers and the converters have responded to the shutdown, we proceed
         if len(self._stopped_daq_proc_hostnames) == len(self.proc_mngr.active_pids):
-            
-            # Check if all processes have indeed terminated; give it a couple of tries due to the shutdown of a server can take a second or two 
-            for _ in range(10):
-                time.sleep(0.5)
-                self.proc_mngr.check_active_processes()
-                
-                if not any(self.proc_mngr.active_pids[h][pid]['active'] for h in self.proc_mngr.active_pids for pid in self.proc_mngr.active_pids[h]):
-                    self._shutdown_complete = True
-                    break
-            
-            # Unfortunately, we could not verify the close, inform user and close
+
+            # Processes which have not yet terminated and number of checks without any of them terminating
+            active_pids = self.proc_mngr.active_pids
+            self._alive_procs = [(h, pid) for h in active_pids for pid in active_pids[h] if active_pids[h][pid]['active']]
+            self._validate_close_checks = 0
+
+            self._check_alive_procs()
+
+    def _check_alive_procs(self):
+        """Checks the status of the remaining processes in a separate thread to keep the GUI responsive"""
+
+        check_worker = QtWorker(func=self.proc_mngr.check_active_processes)
+        self._connect_worker_exception(worker=check_worker)
+        check_worker.signals.finished.connect(self._update_alive_procs)
+        self.threadpool.start(check_worker)
+
+    def _update_alive_procs(self, interval=200, max_checks=10):
+        """Updates the remaining processes after a status check. Checks again after *interval* ms until all processes
+        have terminated; if none terminate within *max_checks* consecutive checks, the user is asked how to proceed."""
+
+        active_pids = self.proc_mngr.active_pids
+        alive_procs = [(h, pid) for h, pid in self._alive_procs if active_pids[h][pid]['active']]
+
+        # Give it a couple of tries since the shutdown of a server can take a second or two
+        self._validate_close_checks = 0 if len(alive_procs) < len(self._alive_procs) else self._validate_close_checks + 1
+        self._alive_procs = alive_procs
+
+        if not self._alive_procs:
+            self._shutdown_complete = True
+
+        elif self._validate_close_checks < max_checks:
+            QtCore.QTimer.singleShot(interval, self._check_alive_procs)
+            return
+
+        # Unfortunately, we could not verify the close, inform user and close
+        else:
+
+            msg = "Shutdown of the converter and server processes could not be validated.\n" \
+                  "Click 'Retry' to restart the shutdown and validation process.\n" \
+                  "Click 'Abort' to kill all remaining processes and close the application.\n" \
+                  "Click 'Ignore' to do nothing and close the application."
+
+            msg_box = self._get_msg_box(title='Shutdown could not be validated',
+                                        buttons=QtWidgets.QMessageBox.Ignore | QtWidgets.QMessageBox.Retry | QtWidgets.QMessageBox.Abort)
+            msg_box.setText(msg)
+            reply = msg_box.exec()
+
+            if reply == QtWidgets.QMessageBox.Ignore:
+                self._shutdown_complete = True
+            elif reply == QtWidgets.QMessageBox.Abort:
+                for host, pid in self._alive_procs:
+                    self.proc_mngr.kill_proc(hostname=host, pid=pid)
+                self._shutdown_complete = True
             else:
+                self._shutdown_initiated = False
+                self._stopped_daq_proc_hostnames.clear()
 
-                msg = "Shutdown of the converter and server processes could not be validated.\n" \
-                      "Click 'Retry' to restart the shutdown and validation process.\n" \
-                      "Click 'Abort' to kill all remaining processes and close the application.\n" \
-                      "Click 'Ignore' to do nothing and close the application."
-
-                msg_box = QtWidgets.QMessageBox(self)
-                msg_box.setWindowTitle('Shutdown could not be validated')
-                msg_box.setText(msg)
-                msg_box.setStandardButtons(QtWidgets.QMessageBox.Ignore | QtWidgets.QMessageBox.Retry | QtWidgets.QMessageBox.Abort)
-                reply = msg_box.exec()
-
-                if reply == QtWidgets.QMessageBox.Ignore:
-                    self._shutdown_complete = True
-                elif reply == QtWidgets.QMessageBox.Abort:
-                    for host in self.proc_mngr.active_pids:
-                        for pid in self.proc_mngr.active_pids[host]:
-                            if self.proc_mngr.active_pids[host][pid]['active']:
-                                self.proc_mngr.kill_proc(hostname=host, pid=pid)
-                    self._shutdown_complete = True
-                else:
-                    self._shutdown_initiated = False
-                    self._stopped_daq_proc_hostnames.clear()
-
-            self.close()
+        self.close()
+
+    def _get_msg_box(self, title, buttons):
+        """Returns the message box with *title* and standard *buttons*; it is only created when it is first needed and re-used after"""
+
+        if title not in self._msg_boxes:
+            msg_box = QtWidgets.QMessageBox(self)
+            msg_box.setWindowTitle(title)
+            msg_box.setStandardButtons(buttons)
+            self._msg_boxes[title] = msg_box
+
+        return self._msg_boxes[title]
 
     def _validate_no_scan(self):
 
@@ -840,10 +1146,8 @@ class IrradGUI(QtWidgets.QMainWindow):
                   "Click 'Abort' to terminate the scan and close the application.\n" \
                   "Click 'Cancel' to continue the scan and the application.".format(server_names)
 
-            msg_box = QtWidgets.QMessageBox(self)
-            msg_box.setWindowTitle('Scan in progress!')
+            msg_box = self._get_msg_box(title='Scan in progress!', buttons=QtWidgets.QMessageBox.Cancel | QtWidgets.QMessageBox.Abort)
             msg_box.setText(msg)
-            msg_box.setStandardButtons(QtWidgets.QMessageBox.Cancel | QtWidgets.QMessageBox.Abort)
             reply = msg_box.exec()
 
             if reply == QtWidgets.QMessageBox.Cancel:
@@ -877,22 +1181,18 @@ class IrradGUI(QtWidgets.QMainWindow):
                 # Check
                 self.proc_mngr.check_active_processes()
 
-                # Loop over all started processes and send shutdown cmd
-                for host in self.proc_mngr.active_pids:
-                    
-                    target = 'interpreter' if host == 'localhost' else 'server'
-                    
-                    shutdown_worker = QtWorker(func=self._send_cmd_get_reply,
-                                            hostname=host,
-                                            cmd_dict={'target': target, 'cmd': 'shutdown'},
-                                            timeout=5)
-                    # Make connections
-                    self._connect_worker_exception(worker=shutdown_worker)
-                    shutdown_worker.signals.finished.connect(lambda h=host: self._stopped_daq_proc_hostnames.append(h))
-                    shutdown_worker.signals.finished.connect(self._validate_close)
-
-                    # Start
-                    self.threadpool.start(shutdown_worker)
+                # Send shutdown cmd to all started processes at once
+                hosts = list(self.proc_mngr.active_pids)
+
+                shutdown_worker = QtWorker(func=self._shutdown_daq_procs, hosts=hosts, timeout=5)
+
+                # Make connections
+                self._connect_worker_exception(worker=shutdown_worker)
+                shutdown_worker.signals.finished.connect(lambda: self._stopped_daq_proc_hostnames.extend(hosts))
+                shutdown_worker.signals.finished.connect(self._validate_close)
+
+                # Start
+                self.threadpool.start(shutdown_worker)
 
                 self._shutdown_initiated = True
 
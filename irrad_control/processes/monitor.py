@@ -28,6 +28,14 @@ class MonitorGUI(IrradGUI):
 
         self.setup = setup
 
+        # There is no control tab; ignore data which is only displayed there
+        for data_type in ('damage', 'scan', 'axis'):
+            del self._data_handlers[data_type]
+
+        # Neither are there motorstages nor scans; ignore their replies
+        self._reply_handlers = {(sender, reply): handler for (sender, reply), handler in self._reply_handlers.items()
+                                if sender in ('server', 'IrradDAQBoard', 'interpreter') and reply != 'motorstages'}
+
         self.ions = get_ions()
 
         # Process the setup and ensure it is a setup dict
@@ -36,6 +44,28 @@ class MonitorGUI(IrradGUI):
         # Make minimal window for interaction with user
         self._init_input_ui()
 
+    def _make_input_callbacks(self, daq_setup, spbx_energy):
+        """Returns callbacks which update *daq_setup* to a given ion name and initial energy, respectively.
+        The ion is resolved once on selection; the energy range of *spbx_energy* is set accordingly."""
+
+        ions = self.ions
+
+        # Currently selected ion
+        selected = {}
+
+        def update_ion(ion):
+            selected['ion'] = ions[ion]
+            daq_setup['ion'] = ion
+            spbx_energy.setRange(*selected['ion'].ekin_range())
+
+        def update_energy(ene):
+            ion = selected['ion']
+            daq_setup.update({'ekin_initial': ene,
+                              'ekin': ion.ekin_at_dut(ene),
+                              'lambda': ion.calibration(at_energy=ene, as_dict=True)})
+
+        return update_ion, update_energy
+
     def _process_setup(self):
         
         # No setup has been provided, look for default setup file 
@@ -75,9 +105,12 @@ class MonitorGUI(IrradGUI):
         tab_widget = QtWidgets.QTabWidget()
 
         # Loop over servers in setup
-        for server in self.setup['server']:
+        for server_setup in self.setup['server'].values():
 
-            server_name = self.setup['server'][server]['name']
+            server_name = server_setup['name']
+
+            # DAQ setup of this server which is updated by the inputs
+            daq_setup = server_setup['daq']
 
             # Monitor specific inputs
             monitor_widget = GridContainer('Monitor input')
@@ -94,23 +127,14 @@ class MonitorGUI(IrradGUI):
             spbx_energy.setSuffix(' MeV')
 
             # Connections
-            
-            # Update ion type
-            for con in [lambda ion, s=server: self.setup['server'][s]['daq'].update({'ion': ion}),
-                        lambda ion, spx=spbx_energy: spx.setRange(*self.ions[ion].ekin_range())]:
-                combo_ion.currentTextChanged.connect(con)
-             
-            # Update energy, energy at dut and calibration
-            for con in [lambda ene, s=server: 
-                        self.setup['server'][s]['daq'].update({'ekin_initial': ene,
-                                                               'ekin': self.ions[self.setup['server'][s]['daq']['ion']].ekin_at_dut(ene)}),
-                        lambda ene, s=server: 
-                        self.setup['server'][s]['daq'].update({'lambda': self.ions[self.setup['server'][s]['daq']['ion']].calibration(at_energy=ene, as_dict=True)})]:
-            
-                spbx_energy.valueChanged.connect(con)
 
-            # Emit ion once to set correct energy ranges
-            combo_ion.currentTextChanged.emit(combo_ion.currentText())
+            # Update ion type and energy range as well as energy, energy at dut and calibration
+            update_ion, update_energy = self._make_input_callbacks(daq_setup=daq_setup, spbx_energy=spbx_energy)
+            combo_ion.currentTextChanged.connect(update_ion)
+            spbx_energy.valueChanged.connect(update_energy)
+
+            # Apply initial ion once to set correct energy ranges
+            update_ion(combo_ion.currentText())
 
             # Add widgets
             monitor_widget.add_widget(widget=[label_ion, combo_ion])
@@ -123,23 +147,24 @@ class MonitorGUI(IrradGUI):
         # Session input
         session_widget = SessionSetup('Session input')
         session_widget.setupChanged.connect(lambda stp: self.setup['session'].update(stp))
-        session_widget.widgets['logging_combo'].currentTextChanged.connect(lambda lvl: self.log_widget.change_level(lvl))
+        session_widget.widgets['logging_combo'].currentTextChanged.connect(self.log_widget.change_level)
         session_widget.widgets['folder_edit'].setText(tmp_path)  # default to tmp dir
         main_widget.layout().addWidget(session_widget)
         
         # Button start
         btn_start = QtWidgets.QPushButton('Start monitor')
 
-        for con in [lambda _, mw=main_widget: mw.setEnabled(False),
-                    self.minimal_input_window.close,
-                    self.show,
-                    lambda _: self.setup['session'].update(session_widget.setup()),
-                    lambda _: save_yaml(path=f"{self.setup['session']['outfile']}.yaml", data=self.setup),
-                    lambda _: self._init_setup(setup=self.setup),
-                    lambda _: self.info_dock.setVisible(False),
-                    lambda _: self.daq_dock.setVisible(False)]:
-
-            btn_start.clicked.connect(con)
+        def _on_start(_):
+            main_widget.setEnabled(False)
+            self.minimal_input_window.close()
+            self.show()
+            self.setup['session'].update(session_widget.setup())
+            save_yaml(path=f"{self.setup['session']['outfile']}.yaml", data=self.setup)
+            self._init_setup(setup=self.setup)
+            self.info_dock.setVisible(False)
+            self.daq_dock.setVisible(False)
+
+        btn_start.clicked.connect(_on_start)
         
         main_widget.layout().addStretch()
         main_widget.layout().addWidget(btn_start)
@@ -171,127 +196,34 @@ class MonitorGUI(IrradGUI):
     def _started_daq_proc(self, hostname):
         """A DQAProcess has been sucessfully started on *hostname*"""
         
-        self._started_daq_proc_hostnames.append(hostname)
+        self._started_daq_proc_hostnames.add(hostname)
 
         # Enable Control and Monitor tabs for this
         if hostname in self.setup['server']:
             self.monitor_tab.enable_monitor(server=hostname)
 
-        # All servers have launched successfully
-        if all(s in self._started_daq_proc_hostnames for s in self.setup['server']):
-            # The interpreter has also succesfully started
-            if 'localhost' in self._started_daq_proc_hostnames:
-
-                # The application has started succesfully
-                logging.info("All servers and the converter have started successfully!")
-                self.pdiag.setLabelText('Application launched successfully!')
-                self.tabs.setCurrentIndex(self.tabs.indexOf(self.monitor_tab))
-                self.pdiag.setLabelText('Application launched successfully!\nCompensating raw data offsets of {} server(s)...'.format(len(self.setup['server'])))
-                
-                # Send offset compensation command to all servers; in monitor there is no contorl tab
-                for s in self.setup['server']:
-                    self.send_cmd(hostname='localhost', target='interpreter', cmd='zero_offset', cmd_data=s)
-
-                QtCore.QTimer.singleShot(10000, self.pdiag.close)
-
-    def handle_data(self, data):
-
-        server = data['meta']['name']
-
-        # Check whether data is interpreted
-        if data['meta']['type'] == 'raw':
-            self.daq_info_widget.update_raw_data(data)
-            self.monitor_tab.plots[server]['raw_plot'].set_data(meta=data['meta'], data=data['data'])
-
-        # Check whether data is interpreted
-        elif data['meta']['type'] == 'beam':
-            self.daq_info_widget.update_beam_current(data)
-            self.monitor_tab.plots[server]['pos_plot'].set_data(data)
-            self.monitor_tab.plots[server]['current_plot'].set_data(meta=data['meta'], data=data['data']['current'])
-            self.monitor_tab.plots[server]['see_current_plot'].set_data(meta=data['meta'], data=data['data']['see'])
-
-            if 'sey' in data['data']['see']:
-                self.monitor_tab.plots[server]['sey_plot'].set_data(data['data']['see']['sey'])
-            if 'frac_h' in data['data']['see']:
-                self.monitor_tab.plots[server]['sem_h_plot'].set_data(data['data']['see']['frac_h'])
-            if 'frac_v' in data['data']['see']:
-                self.monitor_tab.plots[server]['sem_v_plot'].set_data(data['data']['see']['frac_v'])
+        # All servers and the interpreter have launched successfully
+        if self._expected_daq_hosts <= self._started_daq_proc_hostnames:
 
-        elif data['meta']['type'] == 'hist':
-            if 'beam_position_idxs' in data['data']:
-                self.monitor_tab.plots[server]['pos_plot'].update_hist(data['data']['beam_position_idxs'])
-            if 'see_horizontal_idx' in data['data']:
-                self.monitor_tab.plots[server]['sem_h_plot'].update_hist(data['data']['see_horizontal_idx'])
-            if 'see_vertical_idx' in data['data']:
-                self.monitor_tab.plots[server]['sem_v_plot'].update_hist(data['data']['see_vertical_idx'])
-            if 'sey_idx' in data['data']:
-                self.monitor_tab.plots[server]['sey_plot'].update_hist(data['data']['sey_idx'])
-
-        elif data['meta']['type'] == 'temp_arduino':
-
-            self.monitor_tab.plots[server]['temp_arduino_plot'].set_data(meta=data['meta'], data=data['data'])
-
-        elif data['meta']['type'] == 'temp_daq_board':
-            self.monitor_tab.plots[server]['temp_daq_board_plot'].set_data(meta=data['meta'], data=data['data'])
-
-        elif data['meta']['type'] == 'dose_rate':
-            self.monitor_tab.plots[server]['dose_rate_plot'].set_data(meta=data['meta'], data=data['data'])
-
-    def handle_reply(self, reply_dict):
-
-        reply = reply_dict['reply']
-        _type = reply_dict['type']
-        sender = reply_dict['sender']
-        hostname = reply_dict['hostname']
-        reply_data = None if 'data' not in reply_dict else reply_dict['data']
-
-        if _type == 'STANDARD':
-
-            if sender == 'server':
-
-                if reply == 'start':
-                    logging.info("Successfully started server on at IP {} with PID {}".format(hostname, reply_data))
-                    self._started_daq_proc(hostname=hostname)
-
-                elif reply == 'shutdown':
-
-                    logging.info("Server at {} confirmed shutdown".format(hostname))
-
-            elif sender == 'IrradDAQBoard':
-
-                if reply == 'set_ifs':
-                    cmd_data = {'server': hostname,
-                                'ifs': reply_data['callback']['result'],
-                                'group': reply_data['call']['kwargs']['group']}
-                    self.send_cmd(hostname='localhost', target='interpreter', cmd='update_group_ifs', cmd_data=cmd_data)
-                    self.send_cmd(hostname='localhost', target='interpreter', cmd='record_data', cmd_data=(hostname, True))
-
-            elif sender == 'interpreter':
-
-                if reply == 'start':
-                    logging.info("Successfully started interpreter on {} with PID {}".format(hostname, reply_data))
-                    self._started_daq_proc(hostname=hostname)
-
-                if reply == 'record_data':
-                    server, state = reply_data
-                    self.daq_info_widget.update_rec_state(server=server, state=state)
-
-                if reply == 'shutdown':
-
-                    logging.info("Interpreter confirmed shutdown")
+            # The application has started succesfully
+            logging.info("All servers and the converter have started successfully!")
+            self.pdiag.setLabelText('Application launched successfully!')
+            self.tabs.setCurrentIndex(self.tabs.indexOf(self.monitor_tab))
+            self.pdiag.setLabelText('Application launched successfully!\nCompensating raw data offsets of {} server(s)...'.format(len(self.setup['server'])))
+            
+            # Send offset compensation command to all servers; in monitor there is no contorl tab
+            for s in self.setup['server']:
+                self.send_cmd(hostname='localhost', target='interpreter', cmd='zero_offset', cmd_data=s)
 
-            # Debug
-            msg = "Standard {} reply received: '{}' with data '{}'".format(sender, reply, reply_data)
-            logging.debug(msg)
+            QtCore.QTimer.singleShot(10000, self.pdiag.close)
 
-        elif _type == 'ERROR':
-            msg = "{} error occurred: '{}' with data '{}'".format(sender, reply, reply_data)
-            logging.error(msg)
-            if self.info_dock.isHidden():
-                self.info_dock.setVisible(True)
+    def _on_server_start_reply(self, hostname, sender, reply, reply_data):
+        logging.info("Successfully started server on at IP {} with PID {}".format(hostname, reply_data))
+        self._started_daq_proc(hostname=hostname)
 
-        else:
-            logging.info("Received reply '{}' from '{}' with data '{}'".format(reply, sender, reply_data))
+    def _on_record_data_reply(self, hostname, sender, reply, reply_data):
+        server, state = reply_data
+        self.daq_info_widget.update_rec_state(server=server, state=state)
 
     def _validate_no_scan(self):
         return True
@@ -1,14 +1,13 @@
 import logging
-from time import time, sleep
-from serial import SerialException
+from concurrent.futures import ThreadPoolExecutor
+from time import time
+from zmq.utils import jsonapi
 
-# Package imports
-from irrad_control.devices import devices
-from irrad_control.devices.motorstage import motorstage
+# Package imports; the device drivers are imported when the server is started, see _init_devices
 from irrad_control.devices.motorstage.base_axis import BaseAxis, BaseAxisTracker
-from irrad_control.utils.dut_scan import DUTScan
 from irrad_control.devices.readout import RO_DEVICES
 from irrad_control.processes.daq import DAQProcess
+from irrad_control.utils.utils import dumps_json
 from irrad_control.utils.events import create_irrad_events
 
 
@@ -25,10 +24,19 @@ class IrradServer(DAQProcess):
 
         self._motorstages = []
 
+        # Executes threaded device calls e.g. motorstage movements and scans; created in _start_server
+        self._device_exec = None
+
         self.irrad_events = create_irrad_events()
 
-        # Call init of super class
-        super(IrradServer, self).__init__(name=name)
+        # Handlers of the commands targeting the server itself
+        self._server_cmd_handlers = {'start': self._on_start_cmd,
+                                     'shutdown': self._on_shutdown_cmd,
+                                     'motorstages': self._on_motorstages_cmd,
+                                     'toggle_event': self._on_toggle_event_cmd}
+
+        # Call init of super class; the ADC readout timestamps the samples, run it with real-time priority if permitted
+        super(IrradServer, self).__init__(name=name, realtime={'_daq_adc': 10})
 
     def _start_server(self, setup):
         """Sets up the server process"""
@@ -44,6 +52,9 @@ class IrradServer(DAQProcess):
         # Setup logging
         self._setup_logging()
 
+        # Re-usable worker threads for threaded device calls; generously sized since calls such as scans are long-running
+        self._device_exec = ThreadPoolExecutor(max_workers=8, thread_name_prefix='dev-call')
+
         self._init_devices()
 
         self._setup_devices()
@@ -56,6 +67,11 @@ class IrradServer(DAQProcess):
 
     def _init_devices(self):
 
+        # Only import device drivers and their dependencies once they are needed, to keep the process launch fast
+        from serial import SerialException
+        from irrad_control.devices import devices
+        from irrad_control.devices.motorstage import motorstage
+
         # Dict holding potentially shared ports which connect to multi-device controllers
         shared_ports = {}
 
@@ -65,13 +81,15 @@ class IrradServer(DAQProcess):
                                             sender=self.server)
 
         # Loop over server devices and initialize
-        for dev in self.setup['server']['devices']:
+        for dev, dev_setup in self.setup['server']['devices'].items():
+
+            # Init kwargs of the device
+            init_kwargs = dev_setup['init']
 
             try:
 
-                # Get device and init kwargs
+                # Get device
                 device = getattr(devices, dev)
-                init_kwargs = self.setup['server']['devices'][dev]['init']
 
                 # Check if device is Zaber motorstage which potentially shares port through multi controller
                 if issubclass(device, (devices.ZaberStepAxis, devices.ZaberMultiAxis)):
@@ -107,10 +125,10 @@ class IrradServer(DAQProcess):
                 if type(e) is SerialException:
                     msg = "Could not connect to serial port {}. Maybe it is used by another process?"
 
-                    if 'port' in self.setup['server']['devices'][dev]['init']:
-                        port = self.setup['server']['devices'][dev]['init']['port']
-                    elif 'serial_port' in self.setup['server']['devices'][dev]['init']:
-                        port = self.setup['server']['devices'][dev]['init']['serial_port']
+                    if 'port' in init_kwargs:
+                        port = init_kwargs['port']
+                    elif 'serial_port' in init_kwargs:
+                        port = init_kwargs['serial_port']
                     else:
                         port = 'unknown'
 
@@ -130,26 +148,41 @@ class IrradServer(DAQProcess):
 
         ### Specific device-related procedures ###
 
+        # Readout setup of this server; does not change while the server is running
+        self._readout_setup = self.setup['server'].get('readout', {})
+
         if 'ADCBoard' in self.devices:
-            self.devices['ADCBoard'].drate = self.setup['server']['readout']['sampling_rate']
-            self.devices['ADCBoard'].setup_channels(self.setup['server']['readout']['ch_numbers'])
+            self.devices['ADCBoard'].drate = self._readout_setup['sampling_rate']
+            self.devices['ADCBoard'].setup_channels(self._readout_setup['ch_numbers'])
+
+            # Meta data of the ADC samples; updated in place per sample since each sample is serialized before the next is taken
+            self._adc_meta = {'timestamp': None, 'name': self.server, 'type': 'raw_data'}
+
+            # Names of the ADC channels in readout order
+            self._adc_channels = self._readout_setup['channels']
 
         self._daq_board_ntc_ro = False
-        if 'IrradDAQBoard' in self.devices and self.setup['server']['readout']['device'] == RO_DEVICES.DAQBoard:
+
+        # Switch NTC channels on the IrradDAQBoard every 0.2 s, timed by the ADC samples; time of the next switch
+        self._ntc_switch_interval = 0.2
+        self._next_ntc_switch = None
+
+        if 'IrradDAQBoard' in self.devices and self._readout_setup['device'] == RO_DEVICES.DAQBoard:
             # Set initial ro scales
-            self.devices['IrradDAQBoard'].set_ifs(group='sem',
-                                                  ifs=self.setup['server']['readout']['ro_group_scales']['sem'])
-            self.devices['IrradDAQBoard'].set_ifs(group='ch12',
-                                                  ifs=self.setup['server']['readout']['ro_group_scales']['ch12'])
+            ro_group_scales = self._readout_setup['ro_group_scales']
+            self.devices['IrradDAQBoard'].set_ifs(group='sem', ifs=ro_group_scales['sem'])
+            self.devices['IrradDAQBoard'].set_ifs(group='ch12', ifs=ro_group_scales['ch12'])
 
-            if 'ntc' in self.setup['server']['readout']:
-                ntc_channels = [int(ntc) for ntc in self.setup['server']['readout']['ntc']]
+            if 'ntc' in self._readout_setup:
+                ntc_channels = [int(ntc) for ntc in self._readout_setup['ntc']]
                 self.devices['IrradDAQBoard'].init_ntc_readout(ntc_channels=ntc_channels)
-                self.launch_thread(target=self._sync_ntc_readout)
+                self._next_ntc_switch = time() + self._ntc_switch_interval
                 self._daq_board_ntc_ro = True
 
         if 'ScanStage' in self.devices:
 
+            from irrad_control.utils.dut_scan import DUTScan
+
             # Add special __scan__ device which from now on can be accessed via the direct device calls
             self.devices['__scan__'] = DUTScan(scan_stage=self.devices['ScanStage'],
                                                irrad_events=self.irrad_events)
@@ -160,32 +193,51 @@ class IrradServer(DAQProcess):
                                                addr=self._internal_sub_addr,
                                                sender=self.server)
         
+        if 'ArduinoNTCReadout' in self.devices:
+            # Sensors to read, in order, and their names; static for the lifetime of the server
+            self._temp_setup = self.setup['server']['devices']['ArduinoNTCReadout']['setup']
+            self._temp_sensors = sorted(self._temp_setup)
+
         if 'RadiationMonitor' in self.devices:
             # Add custom methods for being able to pause/resume data sending
             self.devices['RadiationMonitor']._send_data = lambda send: getattr(self.stop_flags['wait_rad_mon'], 'set' if send else 'clear')()
 
-    def daq_thread(self, daq_func):
+    def daq_thread(self, daq_func, dumps=jsonapi.dumps):
         """
-        Does data acquisition in separate thread, retrieving results and putting them into the outgoing queue
+        Does data acquisition in separate thread, retrieving results and putting them into the outgoing queue.
+        *daq_func* returns None if it stopped without data, e.g. on shutdown.
+        The data is serialized to JSON by *dumps*; only pass *dumps_json* for data which is always finite, since it does not preserve NaN.
+        The scheduling configured for the name of *daq_func* in *self.affinity* / *self.realtime* is applied to the thread
         """
 
+        self._apply_scheduling(daq_func.__name__)
+
         internal_data_pub = self.create_internal_data_pub()
 
+        # Bind to locals; the loop runs at the sampling rate
+        is_stopped, pub_send = self.stop_flags['__send__'].is_set, self._pub_send
+
         # Acquire data if not stop signal is set
-        while not self.stop_flags['__send__'].is_set():
+        while not is_stopped():
+
+            res = daq_func()
 
-            meta, data = daq_func()
+            # No data if *daq_func* stopped waiting for the stop signal
+            if res is None:
+                continue
+
+            meta, data = res
 
             # Put data into outgoing queue
-            internal_data_pub.send_json({'meta': meta, 'data': data})
+            pub_send(internal_data_pub, dumps({'meta': meta, 'data': data}), block=True)
 
     def _launch_daq_threads(self):
 
         for dev in self.devices:
 
-            # Start data sending thread
+            # Start data sending thread; ADC voltages are always finite and sampled at the highest rate, serialize them with orjson if available
             if dev == 'ADCBoard':
-                self.launch_thread(target=self.daq_thread, daq_func=self._daq_adc)
+                self.launch_thread(target=self.daq_thread, daq_func=self._daq_adc, dumps=dumps_json)
 
             elif dev == 'ArduinoNTCReadout':
                 self.launch_thread(target=self.daq_thread, daq_func=self._daq_temp)
@@ -199,22 +251,22 @@ class IrradServer(DAQProcess):
         """
 
         # Add meta data and data
-        _meta = {'timestamp': time(), 'name': self.server, 'type': 'raw_data'}
+        _meta = self._adc_meta
+        _meta['timestamp'] = time()
 
-        _data = self.devices['ADCBoard'].read_channels(self.setup['server']['readout']['channels'])
+        _data = self.devices['ADCBoard'].read_channels(self._adc_channels)
 
         # If we're using the NTC readout of the DAqBoard
         if self._daq_board_ntc_ro:
-            _meta['ntc_ch'] = self.devices['IrradDAQBoard'].ntc
-            if self.devices['IrradDAQBoard'].ntc_sync.is_set():
-                self.devices['IrradDAQBoard'].next_ntc()
-                self.devices['IrradDAQBoard'].ntc_sync.clear()
-        return _meta, _data
+            daq_board = self.devices['IrradDAQBoard']
+            _meta['ntc_ch'] = daq_board.ntc
 
-    def _sync_ntc_readout(self, sync_time=0.2):
-        """Sync ADC readout with switching NTC channels on IrradDAQBoard"""
-        while not self.stop_flags['__send__'].wait(sync_time):
-            self.devices['IrradDAQBoard'].ntc_sync.set()
+            # Sync switching NTC channels on IrradDAQBoard with the ADC readout: switch after the sample which passed the interval
+            if _meta['timestamp'] >= self._next_ntc_switch:
+                daq_board.next_ntc()
+                self._next_ntc_switch = _meta['timestamp'] + self._ntc_switch_interval
+
+        return _meta, _data
 
     def _daq_temp(self):
         """
@@ -224,22 +276,21 @@ class IrradServer(DAQProcess):
         # Add meta data and data
         _meta = {'timestamp': time(), 'name': self.server, 'type': 'temp'}
 
-        temp_setup = self.setup['server']['devices']['ArduinoNTCReadout']['setup']
-
         # Read raw temp data
-        raw_temp = self.devices['ArduinoNTCReadout'].get_temp(sorted(temp_setup.keys()))
+        raw_temp = self.devices['ArduinoNTCReadout'].get_temp(self._temp_sensors)
 
-        _data = dict([(temp_setup[sens], raw_temp[sens]) for sens in raw_temp])
+        _data = {self._temp_setup[sens]: temp for sens, temp in raw_temp.items()}
 
         return _meta, _data
 
     def _daq_rad_monitor(self):
 
-        # Wait until we want to read the daq_monitor; less CPU-hungry than pure Event.wait() see https://stackoverflow.com/questions/29082268/python-time-sleep-vs-event-wait/29082411#29082411
-        # Stop waiting with RadiationMonitorDAQ
-        while not self.stop_flags['wait_rad_mon'].is_set():
-            sleep(1)
-        
+        # Block until we want to read the daq_monitor; stop waiting with RadiationMonitorDAQ
+        # Wait in slices to not miss the stop signal in case the flag is never set
+        while not self.stop_flags['wait_rad_mon'].wait(timeout=1.0):
+            if self.stop_flags['__send__'].is_set():
+                return None
+
         dose_rate, frequency = self.devices['RadiationMonitor'].get_dose_rate(return_frequency=True)
 
         # Add meta data and data
@@ -266,13 +317,18 @@ class IrradServer(DAQProcess):
 
             return res
 
+        def _log_exception(future):
+            if not future.cancelled() and future.exception() is not None:
+                logging.error("A {} exception occurred in threaded call of {}.{}: {}".format(type(future.exception()).__name__, device, method, future.exception()))
+
         call_kwargs = {} if call_data is None else call_data.get('kwargs', {})
         callback = False if call_data is None else call_data.get('callback', False)
         call_threaded = False if call_data is None else call_data.get('threaded', False)
 
         try:
             if call_threaded:
-                data = self.launch_thread(target=_call, call_kwargs=call_kwargs, callback=callback)  # data will be None
+                self._device_exec.submit(_call, call_kwargs, callback).add_done_callback(_log_exception)
+                data = None
             else:
                 data =_call(call_kwargs, callback)
             
@@ -280,6 +336,21 @@ class IrradServer(DAQProcess):
         except Exception as e:
             self._send_reply(reply=method, _type='ERROR', sender=device, data=repr(e))
 
+    def _on_start_cmd(self, cmd, data):
+        # Start server with setup which is cmd data
+        self._start_server(data)
+        self._send_reply(reply=cmd, _type='STANDARD', sender='server', data=self.pid)
+
+    def _on_shutdown_cmd(self, cmd, data):
+        self.shutdown()
+
+    def _on_motorstages_cmd(self, cmd, data):
+        reply_data = {ms :{'positions': self.devices[ms].get_positions(), 'props': self.devices[ms].get_physical_props()} for ms in self._motorstages}
+        self._send_reply(reply=cmd, _type='STANDARD', sender='server', data=reply_data)
+
+    def _on_toggle_event_cmd(self, cmd, data):
+        self.irrad_events[data['event']].value.disabled = data['disabled']
+
     def handle_cmd(self, target, cmd, data=None):
         """Handle all commands. After every command a reply must be send."""
 
@@ -288,23 +359,8 @@ class IrradServer(DAQProcess):
             self._call_device_method(device=target, method=cmd, call_data=data)
 
         # Handle server commands
-        elif target == 'server':
-
-            if cmd == 'start':
-
-                # Start server with setup which is cmd data
-                self._start_server(data)
-                self._send_reply(reply=cmd, _type='STANDARD', sender=target, data=self.pid)
-
-            elif cmd == 'shutdown':
-                self.shutdown()
-
-            elif cmd == 'motorstages':
-                reply_data = {ms :{'positions': self.devices[ms].get_positions(), 'props': self.devices[ms].get_physical_props()} for ms in self._motorstages}
-                self._send_reply(reply=cmd, _type='STANDARD', sender=target, data=reply_data)
-
-            elif cmd == 'toggle_event':
-                self.irrad_events[data['event']].value.disabled = data['disabled']
+        elif target == 'server' and cmd in self._server_cmd_handlers:
+            self._server_cmd_handlers[cmd](cmd=cmd, data=data)
 
         else:
             logging.error(f"Command {cmd} with target {target} does not exist for server {self.name}.")
@@ -327,6 +383,10 @@ class IrradServer(DAQProcess):
 
     def clean_up(self):
         """Mandatory clean up - method"""
+        # Drop queued threaded device calls
+        if self._device_exec is not None:
+            self._device_exec.shutdown(wait=False, cancel_futures=True)
+
         # Check if we want to store configs
         for dev in self.devices:
             if hasattr(self.devices[dev], 'save_config'):
@@ -1,12 +1,24 @@
 import logging
 import time
 import fcntl
+from functools import lru_cache
 from subprocess import check_output, CalledProcessError
 
+from zmq.utils import jsonapi
 from irrad_control import lock_file, package_path
 
 
+# orjson is a requirement for fast (de)serialization of JSON messages; fall back to zmq's jsonapi if it is missing nonetheless
+_ORJSON = True
+try:
+    import orjson
+except ModuleNotFoundError:
+    _ORJSON = False
+
+
+@lru_cache(maxsize=None)
 def get_current_git_branch(default='main'):
+    """Returns the active git branch of the package; only looked up once per process since it does not change while running"""
 
     try:
         # use git default installation via subprocess
@@ -72,6 +84,49 @@ def check_zmq_addr(addr):
     return True if protocol else False
 
 
+def dumps_json(obj):
+    """
+    Serialize *obj* to JSON bytes. Uses orjson if available, which also serializes numpy arrays and scalars.
+    Note: orjson serializes non-finite floats to null; only use for messages which do not contain NaN or inf
+
+    Parameters
+    ----------
+    obj: object
+        JSON-serializable Python-object
+
+    Returns
+    -------
+    bytes:
+        UTF-8 encoded JSON
+    """
+    if _ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return jsonapi.dumps(obj)
+
+
+def loads_json(msg):
+    """
+    Deserialize JSON bytes *msg*. Uses orjson if available. Falls back to jsonapi for messages orjson rejects
+    e.g. containing NaN, as serialized by peers using jsonapi / send_json
+
+    Parameters
+    ----------
+    msg: bytes
+        UTF-8 encoded JSON
+
+    Returns
+    -------
+    object:
+        Deserialized Python-object
+    """
+    if _ORJSON:
+        try:
+            return orjson.loads(msg)
+        except orjson.JSONDecodeError:
+            pass
+    return jsonapi.loads(msg)
+
+
 def create_pub_from_ctx(ctx, addr, hwm=10, delay=0.3):
     """
     Create and return a publisher socket from a given context
@@ -229,6 +229,9 @@ if [ "$IRRAD_INSTALL" != false ]; then
     echo "Installing irrad_control into $CONDA_ENV_NAME environment..."
     python -m pip install -e $IRRAD_PATH
   fi
+  # Byte-compile the package once, so the first launch of the processes does not have to
+  echo "Byte-compiling irrad_control..."
+  python -m compileall -q -j 0 $IRRAD_PATH/irrad_control
 fi
 
 # Check if we have the pigpio deamon running if we are on a server
@@ -0,0 +1,44 @@
+import unittest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from irrad_control.analysis.plotting import plot_relative_beam_position
+
+
+class TestPlotting(unittest.TestCase):
+
+    def tearDown(self):
+        plt.close('all')
+
+    def test_relative_beam_position_constant(self):
+
+        rng = np.random.default_rng(0)
+        horizontal_pos = np.full(1000, 12.5)
+        vertical_pos = rng.normal(0, 5, 1000)
+
+        fig, (ax_hist_2d, _, _) = plot_relative_beam_position(horizontal_pos, vertical_pos, n_bins=10)
+
+        # Constant horizontal position is widened by 0.5 to either side and all samples end up in the center column
+        mesh = ax_hist_2d.collections[0]
+        x_lo, x_hi = mesh.get_coordinates()[0, [0, -1], 0]
+        assert (x_lo, x_hi) == (12.0, 13.0)
+        hist_2d = np.asarray(mesh.get_array()).reshape(10, 10)
+        assert np.nansum(hist_2d) == 1000
+        assert np.nansum(hist_2d[:, 5]) == 1000
+
+    def test_relative_beam_position_no_finite(self):
+
+        horizontal_pos = np.full(100, np.nan)
+        vertical_pos = np.linspace(-1, 1, 100)
+
+        fig, (ax_hist_2d, ax_hist_h, ax_hist_v) = plot_relative_beam_position(horizontal_pos, vertical_pos, n_bins=10)
+
+        # Nothing is drawn without a single finite sample
+        assert not ax_hist_2d.collections
+        assert not ax_hist_h.patches and not ax_hist_v.patches
+
+
+if __name__ == '__main__':
+    unittest.main()
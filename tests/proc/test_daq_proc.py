@@ -2,6 +2,7 @@ import os
 import time
 import logging
 import unittest
+import zmq
 
 from irrad_control import pid_file
 from irrad_control.utils.tools import load_yaml
@@ -13,6 +14,11 @@ class BaseDAQProcess(DAQProcess):
     def __init__(self):
         super(BaseDAQProcess, self).__init__(name='TestDAQProcess')
 
+    # Echo commands
+    def handle_cmd(self, target, cmd, data=None):
+        if data is not None:
+            self._send_reply(reply=cmd, _type='STANDARD', sender=target, data=data)
+
     # Define clean up
     def clean_up(self):
         pass
@@ -66,6 +72,27 @@ class TestDAQProcess(unittest.TestCase):
         # Check that all ports are found
         assert all(isinstance(port, int) for port in pid_file_content['ports'].values())
 
+    def test_cmd_batch(self):
+
+        pid_file_content = load_yaml(pid_file)
+
+        req = zmq.Context.instance().socket(zmq.REQ)
+        req.setsockopt(zmq.RCVTIMEO, 5000)
+        req.setsockopt(zmq.LINGER, 0)
+        req.connect('tcp://localhost:{}'.format(pid_file_content['ports']['cmd']))
+
+        try:
+            req.send_json({'target': 'test', 'cmd': 'batch', 'data': [{'cmd': 'first', 'data': 1}, {'cmd': 'second'}]})
+            reply = req.recv_json()
+        finally:
+            req.close()
+
+        # One reply containing the replies of each command in order
+        assert reply['reply'] == 'batch'
+        assert [r['reply'] for r in reply['data']] == ['first', 'second']
+        assert reply['data'][0]['data'] == 1
+        assert 'data' not in reply['data'][1]
+
 
 if __name__ == '__main__':
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - [%(levelname)-8s] (%(threadName)-10s) %(message)s")